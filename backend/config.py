@@ -20,6 +20,93 @@ class Config:
     VIDEO_FPS = int(os.getenv("VIDEO_FPS", 30))
     DEFAULT_VIDEO_DURATION = int(os.getenv("DEFAULT_VIDEO_DURATION", 30))
     
+    # Video Rendering Configuration
+    VIDEO_RENDER_ENABLED = os.getenv("VIDEO_RENDER_ENABLED", "true").lower() == "true"
+    FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+    FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+    VIDEO_PRESET = os.getenv("VIDEO_PRESET", "medium")
+    VIDEO_CRF = int(os.getenv("VIDEO_CRF", 23))
+    RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", os.cpu_count() or 1))
+    VIDEO_MOTION_ENABLED = os.getenv("VIDEO_MOTION_ENABLED", "true").lower() == "true"
+    VIDEO_TRANSITION_SECONDS = float(os.getenv("VIDEO_TRANSITION_SECONDS", 0.5))
+    
+    # Draft Render Configuration (quick review previews)
+    DRAFT_VIDEO_WIDTH = int(os.getenv("DRAFT_VIDEO_WIDTH", 512))
+    DRAFT_VIDEO_HEIGHT = int(os.getenv("DRAFT_VIDEO_HEIGHT", 288))
+    DRAFT_VIDEO_FPS = int(os.getenv("DRAFT_VIDEO_FPS", 12))
+    DRAFT_VIDEO_PRESET = os.getenv("DRAFT_VIDEO_PRESET", "ultrafast")
+    DRAFT_VIDEO_CRF = int(os.getenv("DRAFT_VIDEO_CRF", 32))
+    
+    # Generation Concurrency
+    IMAGE_CONCURRENCY = int(os.getenv("IMAGE_CONCURRENCY", 4))
+    AUDIO_CONCURRENCY = int(os.getenv("AUDIO_CONCURRENCY", 4))
+    
+    # Provider HTTP Client Configuration
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30.0))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 10.0))
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    
+    # Text-to-speech Configuration
+    TTS_MAX_CHARS = int(os.getenv("TTS_MAX_CHARS", 200))
+    
+    # Generated content caches
+    IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "true").lower() == "true"
+    IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "cache/images")
+    IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "cache/tts")
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    SCRIPT_CACHE_ENABLED = os.getenv("SCRIPT_CACHE_ENABLED", "true").lower() == "true"
+    SCRIPT_CACHE_DIR = os.getenv("SCRIPT_CACHE_DIR", "cache/scripts")
+    SCRIPT_CACHE_MAX_BYTES = int(os.getenv("SCRIPT_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+    SCRIPT_CACHE_TTL_SECONDS = int(os.getenv("SCRIPT_CACHE_TTL_SECONDS", 86400))
+    
+    # Run Store Configuration ("memory" or "sqlite")
+    RUN_STORE_BACKEND = os.getenv("RUN_STORE_BACKEND", "memory")
+    RUN_STORE_PATH = os.getenv("RUN_STORE_PATH", "data/runs.db")
+    RUN_STORE_MAX_RUNS = int(os.getenv("RUN_STORE_MAX_RUNS", 1000))
+    RUN_STORE_FLUSH_INTERVAL = float(os.getenv("RUN_STORE_FLUSH_INTERVAL", 0.5))
+    THROUGHPUT_WINDOW_SECONDS = int(os.getenv("THROUGHPUT_WINDOW_SECONDS", 900))
+    THROUGHPUT_BUCKET_SECONDS = int(os.getenv("THROUGHPUT_BUCKET_SECONDS", 60))
+    THROUGHPUT_RETENTION_SECONDS = int(os.getenv("THROUGHPUT_RETENTION_SECONDS", 86400))
+    
+    # Run event streams
+    RUN_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("RUN_EVENTS_KEEPALIVE_SECONDS", 15))
+    RUN_EVENTS_QUEUE_SIZE = int(os.getenv("RUN_EVENTS_QUEUE_SIZE", 16))
+    
+    # Task events pushed by workers; Orkes is then only polled to reconcile
+    TASK_EVENTS_ENABLED = os.getenv("TASK_EVENTS_ENABLED", "true").lower() == "true"
+    TASK_EVENTS_PATH = os.getenv("TASK_EVENTS_PATH", "data/task_events.db")
+    TASK_EVENTS_POLL_INTERVAL = float(os.getenv("TASK_EVENTS_POLL_INTERVAL", 0.25))
+    TASK_EVENTS_RETENTION_SECONDS = int(os.getenv("TASK_EVENTS_RETENTION_SECONDS", 3600))
+    WORKFLOW_RECONCILE_INTERVAL = float(os.getenv("WORKFLOW_RECONCILE_INTERVAL", 30))  # Runs in long steps
+    WORKFLOW_RECONCILE_FAST_INTERVAL = float(os.getenv("WORKFLOW_RECONCILE_FAST_INTERVAL", 5))  # Runs starting up
+    WORKFLOW_RECONCILE_TICK = float(os.getenv("WORKFLOW_RECONCILE_TICK", 1))
+    WORKFLOW_RECONCILE_BATCH_SIZE = int(os.getenv("WORKFLOW_RECONCILE_BATCH_SIZE", 50))
+    WORKFLOW_TIMEOUT_SECONDS = int(os.getenv("WORKFLOW_TIMEOUT_SECONDS", 0))  # 0 derives it from the task budgets
+    WORKFLOW_REGISTER_ON_STARTUP = os.getenv("WORKFLOW_REGISTER_ON_STARTUP", "true").lower() == "true"
+    WORKFLOW_OWNER_EMAIL = os.getenv("WORKFLOW_OWNER_EMAIL", "video-generator@example.com")
+    SCENE_FANOUT_ENABLED = os.getenv("SCENE_FANOUT_ENABLED", "false").lower() == "true"  # One task per scene
+    SCENE_PIPELINE_ENABLED = os.getenv("SCENE_PIPELINE_ENABLED", "false").lower() == "true"  # Scenes pipelined in one task
+    # Streamed scenes are consumed by the scene pipeline, so streaming follows it unless set explicitly
+    SCRIPT_STREAMING_ENABLED = os.getenv("SCRIPT_STREAMING_ENABLED", str(SCENE_PIPELINE_ENABLED)).lower() == "true"
+    SCENE_STREAM_WAIT_SECONDS = float(os.getenv("SCENE_STREAM_WAIT_SECONDS", 180))  # Longest wait for the next scene
+    SCENE_STREAM_POLL_INTERVAL = float(os.getenv("SCENE_STREAM_POLL_INTERVAL", 0.25))
+    STAGE_OUTPUT_REFS = os.getenv("STAGE_OUTPUT_REFS", "true").lower() == "true"  # Pass large outputs by reference
+    
+    # Workflow engine: "orkes" (Conductor) or "local" (in-process, no server needed)
+    WORKFLOW_ENGINE = os.getenv("WORKFLOW_ENGINE", "orkes")
+    LOCAL_ENGINE_EXECUTOR = os.getenv("LOCAL_ENGINE_EXECUTOR", "process")  # or "thread"
+    LOCAL_ENGINE_WORKERS = int(os.getenv("LOCAL_ENGINE_WORKERS", max(4, os.cpu_count() or 1)))  # Stages are mostly I/O bound
+    LOCAL_ENGINE_MAX_WORKFLOWS = int(os.getenv("LOCAL_ENGINE_MAX_WORKFLOWS", 1000))
+    
+    # Orkes API calls
+    ORKES_MAX_CONCURRENT_CALLS = int(os.getenv("ORKES_MAX_CONCURRENT_CALLS", 8))
+    ORKES_CALL_TIMEOUT = float(os.getenv("ORKES_CALL_TIMEOUT", 15))
+    
     # Directories
     TEMP_DIR = "temp"
     OUTPUT_DIR = "output"
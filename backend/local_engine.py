@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from uuid import uuid4
+from workers.base_worker import BaseWorker
+from workflow_definition import WORKFLOW_DEFINITION
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_TERMINAL_STATUSES = ("COMPLETED", "FAILED", "TERMINATED")
+
+class LocalTask:
+    """The parts of a Conductor task that BaseWorker.execute uses"""
+    
+    def __init__(self, task_id: str, workflow_instance_id: str, input_data: dict):
+        self.task_id = task_id
+        self.workflow_instance_id = workflow_instance_id
+        self.input_data = input_data
+        self.output_data = {}
+        self.status = None
+
+# Worker instances of each pool process, created on first use
+_process_workers: Dict[type, BaseWorker] = {}
+
+def execute_task(worker_class: type, task_id: str, workflow_id: str, input_data: dict) -> tuple:
+    """Run one task on a worker in this process; module-level so process pools can pickle it"""
+    worker = _process_workers.get(worker_class)
+    if worker is None:
+        worker = _process_workers[worker_class] = worker_class()
+        
+    task = worker.execute(LocalTask(task_id, workflow_id, input_data))
+    return task.status, task.output_data
+
+class LocalEngine:
+    """In-process stand-in for Orkes that interprets workflow definitions directly on the workers"""
+    
+    def __init__(self):
+        self.workers: List[BaseWorker] = []
+        self._definitions: Dict[str, dict] = {WORKFLOW_DEFINITION["name"]: WORKFLOW_DEFINITION}
+        self._executor: Optional[Executor] = None
+        self._workflows: "OrderedDict[str, dict]" = OrderedDict()
+        self._runners: Dict[str, asyncio.Task] = {}
+        
+    def add_worker(self, worker: BaseWorker):
+        """Add a worker; tasks with its definition name run on it"""
+        self.workers.append(worker)
+        
+    async def start_workers(self):
+        """Create the pool that tasks run on"""
+        if self._executor is None:
+            self._executor = self._create_executor()
+            logger.info(f"Local engine ready with {len(self.workers)} workers ({Config.LOCAL_ENGINE_EXECUTOR} pool)")
+            
+    def stop_workers(self):
+        """Stop all workers"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("All workers stopped")
+            
+    def close(self):
+        """Stop the task pool"""
+        self.stop_workers()
+        
+    async def register_workflow(self, definition: dict, task_definitions: Optional[List[dict]] = None):
+        """Register (or replace) a workflow definition; task definitions need no registration locally"""
+        self._definitions[definition["name"]] = definition
+        logger.info(f"Registered workflow {definition['name']} v{definition.get('version', 1)}")
+        
+    async def start_workflow(self, workflow_name: str, input_data: dict, version: int = 1) -> str:
+        """Start a workflow execution on the current event loop"""
+        if workflow_name not in self._definitions:
+            raise Exception(f"Workflow {workflow_name} is not registered")
+            
+        workflow_id = str(uuid4())
+        self._workflows[workflow_id] = {
+            "workflowId": workflow_id,
+            "workflowName": workflow_name,
+            "version": version,
+            "status": "RUNNING",
+            "input": input_data,
+            "output": {},
+            "tasks": [],
+            "startTime": int(time.time() * 1000),
+            "endTime": None,
+            "reasonForIncompletion": None
+        }
+        self._evict()
+        
+        self._runners[workflow_id] = asyncio.create_task(
+            self._run_workflow(workflow_id, self._definitions[workflow_name])
+        )
+        logger.info(f"Started workflow {workflow_name} with ID: {workflow_id}")
+        return workflow_id
+        
+    async def get_workflow_status(self, workflow_id: str) -> dict:
+        """Get workflow execution status in the same shape as OrkesClient"""
+        workflow = self._workflows.get(workflow_id)
+        if not workflow:
+            raise Exception(f"Workflow {workflow_id} not found")
+        return {**workflow, "tasks": [dict(task) for task in workflow["tasks"]]}
+        
+    async def get_workflow_statuses(self, workflow_ids: List[str]) -> Dict[str, dict]:
+        """Get the status of many workflows, keyed by workflow id"""
+        return {
+            workflow_id: await self.get_workflow_status(workflow_id)
+            for workflow_id in workflow_ids
+            if workflow_id in self._workflows
+        }
+        
+    async def terminate_workflow(self, workflow_id: str):
+        """Terminate a workflow; a task already running finishes but its result is dropped"""
+        workflow = self._workflows.get(workflow_id)
+        if not workflow:
+            raise Exception(f"Workflow {workflow_id} not found")
+            
+        runner = self._runners.pop(workflow_id, None)
+        if runner:
+            runner.cancel()
+        self._finish(workflow, "TERMINATED", "Terminated by user")
+        logger.info(f"Terminated workflow: {workflow_id}")
+        
+    async def _run_workflow(self, workflow_id: str, definition: dict):
+        """Run the definition's tasks in order and resolve its outputs"""
+        workflow = self._workflows[workflow_id]
+        context = {"workflow": {"input": workflow["input"]}}
+        
+        try:
+            await self._run_tasks(workflow, definition["tasks"], context)
+            
+            last_task = definition["tasks"][-1]["taskReferenceName"]
+            workflow["output"] = _resolve(definition.get("outputParameters"), context) or context[last_task]["output"]
+            self._finish(workflow, "COMPLETED")
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Workflow {workflow_id} failed: {e}")
+            self._finish(workflow, "FAILED", str(e))
+        finally:
+            self._runners.pop(workflow_id, None)
+            
+    async def _run_tasks(self, workflow: dict, task_defs: List[dict], context: dict):
+        """Run a sequence of tasks: SIMPLE on the workers, forked branches concurrently, JOIN in place"""
+        forked_refs: List[str] = []
+        for task_def in task_defs:
+            task_type = task_def.get("type", "SIMPLE")
+            if task_type == "SIMPLE":
+                await self._run_task(workflow, task_def, context)
+            elif task_type == "FORK_JOIN":
+                self._record_system_task(workflow, task_def, "FORK", {})
+                await asyncio.gather(*(
+                    self._run_tasks(workflow, branch, context) for branch in task_def["forkTasks"]
+                ))
+            elif task_type == "FORK_JOIN_DYNAMIC":
+                forked_refs = await self._run_dynamic_fork(workflow, task_def, context)
+            elif task_type == "JOIN":
+                # Like Conductor, a join's output maps each joined task to its output;
+                # joining a dynamic fork waits on whatever the fork produced
+                join_on = task_def.get("joinOn") or forked_refs
+                output = {ref: context[ref]["output"] for ref in join_on}
+                self._record_system_task(workflow, task_def, "JOIN", output)
+                context[task_def["taskReferenceName"]] = {"input": {}, "output": output}
+            else:
+                raise Exception(f"Task type {task_type} is not supported by the local engine")
+                
+    async def _run_dynamic_fork(self, workflow: dict, task_def: dict, context: dict) -> List[str]:
+        """Run the tasks listed in a FORK_JOIN_DYNAMIC's input concurrently, returning their references"""
+        fork_input = _resolve(task_def.get("inputParameters", {}), context)
+        dynamic_tasks = fork_input.get(task_def["dynamicForkTasksParam"]) or []
+        dynamic_inputs = fork_input.get(task_def["dynamicForkTasksInputParamName"]) or {}
+        self._record_system_task(workflow, task_def, "FORK", {})
+        
+        # Inputs are already concrete values, not expressions
+        await asyncio.gather(*(
+            self._run_task(workflow, dynamic_task, context, dynamic_inputs.get(dynamic_task["taskReferenceName"], {}))
+            for dynamic_task in dynamic_tasks
+        ))
+        return [dynamic_task["taskReferenceName"] for dynamic_task in dynamic_tasks]
+        
+    def _record_system_task(self, workflow: dict, task_def: dict, task_type: str, output: dict):
+        """Add an already-completed system task (fork or join) to the workflow's task list"""
+        now = int(time.time() * 1000)
+        workflow["tasks"].append({
+            "taskId": str(uuid4()),
+            "taskType": task_type,
+            "referenceTaskName": task_def["taskReferenceName"],
+            "status": "COMPLETED",
+            "outputData": output,
+            "startTime": now,
+            "endTime": now
+        })
+        
+    async def _run_task(self, workflow: dict, task_def: dict, context: dict, input_data: Optional[dict] = None):
+        """Run one task on the pool and record its output for later inputs"""
+        worker = next((w for w in self.workers if w.get_task_definition_name() == task_def["name"]), None)
+        if worker is None:
+            raise Exception(f"No worker registered for task {task_def['name']}")
+        if self._executor is None:
+            await self.start_workers()
+            
+        if input_data is None:
+            input_data = _resolve(task_def["inputParameters"], context)
+        task = {
+            "taskId": str(uuid4()),
+            "taskType": task_def["name"],
+            "referenceTaskName": task_def["taskReferenceName"],
+            "status": "IN_PROGRESS",
+            "startTime": int(time.time() * 1000),
+            "endTime": None
+        }
+        workflow["tasks"].append(task)
+        
+        loop = asyncio.get_running_loop()
+        status, output = await loop.run_in_executor(
+            self._executor, execute_task, type(worker), task["taskId"], workflow["workflowId"], input_data
+        )
+        
+        task["status"] = status
+        task["outputData"] = output
+        task["endTime"] = int(time.time() * 1000)
+        context[task_def["taskReferenceName"]] = {"input": input_data, "output": output}
+        if status != "COMPLETED":
+            raise Exception(f"Task {task_def['name']} failed: {(output or {}).get('error')}")
+            
+    def _finish(self, workflow: dict, status: str, reason: Optional[str] = None):
+        """Move a workflow to a terminal status once"""
+        if workflow["status"] in WORKFLOW_TERMINAL_STATUSES:
+            return
+        workflow["status"] = status
+        workflow["reasonForIncompletion"] = reason
+        workflow["endTime"] = int(time.time() * 1000)
+        for task in workflow["tasks"]:
+            if task["status"] == "IN_PROGRESS":
+                task["status"] = "CANCELED"
+                
+    def _evict(self):
+        """Forget the oldest finished workflows beyond LOCAL_ENGINE_MAX_WORKFLOWS"""
+        for workflow_id in list(self._workflows.keys()):
+            if len(self._workflows) <= Config.LOCAL_ENGINE_MAX_WORKFLOWS:
+                break
+            if self._workflows[workflow_id]["status"] in WORKFLOW_TERMINAL_STATUSES:
+                del self._workflows[workflow_id]
+                
+    def _create_executor(self) -> Executor:
+        """Process pool by default so CPU-bound stages don't contend for the GIL"""
+        if Config.LOCAL_ENGINE_EXECUTOR == "thread":
+            return ThreadPoolExecutor(max_workers=Config.LOCAL_ENGINE_WORKERS, thread_name_prefix="local-task")
+        return ProcessPoolExecutor(max_workers=Config.LOCAL_ENGINE_WORKERS)
+
+def _resolve(value, context: dict):
+    """Substitute ${path.to.value} expressions in task inputs from the workflow context"""
+    if isinstance(value, dict):
+        return {key: _resolve(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, context) for item in value]
+    if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
+        resolved = context
+        for part in value[2:-1].split("."):
+            resolved = resolved.get(part) if isinstance(resolved, dict) else None
+        return resolved
+    return value
+
+# Global engine instance
+local_engine = LocalEngine()
@@ -1,25 +1,44 @@
 import asyncio
+import json
 import logging
 import threading
+import time
 import os
 from uuid import uuid4
 from typing import List, Dict, Optional
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
-from orkes_client import orkes_client
-from workers import ScriptWorker, ImageWorker, AudioWorker, VideoWorker
+from run_store import create_run_store, TERMINAL_STATUSES
+from run_events import RunEventBroadcaster
+from workflow_definition import (
+    WORKFLOW_NAME, WORKFLOW_VERSION, WORKFLOW_DEFINITION, WORKFLOW_TIMEOUT_SECONDS, TASK_DEFINITIONS, TASK_TIMEOUTS,
+    get_pipeline_steps, get_step_groups, get_step_name
+)
+from workers import (
+    ScriptWorker, ImageWorker, AudioWorker, VideoWorker,
+    ScenePlanWorker, SceneImageWorker, SceneAudioWorker, ScenePipelineWorker
+)
+from workers.base_worker import BaseWorker
 from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from utils.task_events import task_events
 from config import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Orkes Conductor, or the in-process engine for single-box and offline runs
+if Config.WORKFLOW_ENGINE == "local":
+    from local_engine import local_engine as workflow_client
+else:
+    from orkes_client import orkes_client as workflow_client
+
 app = FastAPI()
 
 # Enable CORS so the Next.js frontend (localhost:3000) can call the API from the browser
@@ -38,6 +57,8 @@ class RunRequest(BaseModel):
     topic: str
     duration: int
     voice: str = "nova"
+    quality: str = "draft"  # Fast low-resolution render for review; POST /runs/{run_id}/render promotes it
+    use_cache: bool = True  # False to always generate a fresh script
 
 class RunResponse(BaseModel):
     run_id: str
@@ -49,17 +70,39 @@ class Run(BaseModel):
     artifacts: List[str]
     workflow_id: Optional[str] = None
     orkes_status: Optional[str] = None
+    created_at: Optional[float] = None
+    final_render: Optional[str] = None  # RENDERING, COMPLETED or FAILED once a final render is requested
+    final_render_started_at: Optional[float] = None
+
+# Store of runs - in-memory or SQLite, selected by RUN_STORE_BACKEND
+run_store = create_run_store()
+run_store_flush_task = None
+# Wakes the flush task early for writes that should reach the store right away
+run_store_flush_requested = asyncio.Event()
+
+# Pushes run updates to /runs/{run_id}/events subscribers in this process
+run_events = RunEventBroadcaster()
+
+# Task events from workers, applied as they arrive; maps workflow ids of active runs
+task_events_task = None
+workflow_runs: Dict[str, str] = {}
+
+# One reconciler polls Orkes for every active run; next poll time per run
+reconciler_task = None
+reconcile_due: Dict[str, float] = {}
+# Last summary update time seen per run, so unchanged workflows aren't fetched in full
+workflow_updates: Dict[str, str] = {}
 
-# In-memory store of runs
-runs: Dict[str, Run] = {}
+# Registers the workflow definition with the engine without holding up startup
+registration_task = None
 
-# Ordered pipeline steps - updated to match actual Orkes workflow
-PIPELINE_STEPS = [
-    "generate_script",
-    "generate_images", 
-    "generate_audio",
-    "assemble_video"
-]
+# Pipeline steps in order, from the workflow definition (images and audio run in parallel)
+PIPELINE_STEPS = get_pipeline_steps()
+STEP_GROUPS = get_step_groups()
+ACTIVE_TASK_STATUSES = ("SCHEDULED", "IN_PROGRESS")
+
+# Steps that take minutes; runs in them are reconciled less often
+LONG_RUNNING_STEPS = ["generate_images", "generate_audio", "assemble_video", "pipeline_scenes"]
 
 # Global variables for worker management
 worker_thread = None
@@ -67,8 +110,19 @@ workers_started = False
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize file directories on startup"""
+    """Initialize file directories and the background run tasks on startup"""
+    global run_store_flush_task, task_events_task, reconciler_task, registration_task
+    
     FileHandler.ensure_directories()
+    run_store_flush_task = asyncio.create_task(_flush_run_store_periodically())
+    reconciler_task = asyncio.create_task(_reconcile_workflows())
+    
+    # The workflow is defined in code; keep the engine's copy in sync with it, in the
+    # background so a slow or unreachable Conductor never delays serving requests
+    if Config.WORKFLOW_REGISTER_ON_STARTUP:
+        registration_task = asyncio.create_task(_register_workflow())
+    if Config.TASK_EVENTS_ENABLED:
+        task_events_task = asyncio.create_task(_consume_task_events())
     logger.info("Application started - directories initialized")
 
 @app.on_event("shutdown") 
@@ -76,11 +130,25 @@ async def shutdown_event():
     """Clean up resources on shutdown"""
     global worker_thread, workers_started
     
-    if workers_started and orkes_client:
+    if workers_started and workflow_client:
         logger.info("Stopping Orkes workers...")
-        orkes_client.stop_workers()
+        workflow_client.stop_workers()
         workers_started = False
         
+    workflow_client.close()
+        
+    # Release pooled provider connections on the worker loop that owns them
+    await asyncio.to_thread(BaseWorker.shutdown_event_loop)
+    
+    for task in (task_events_task, reconciler_task, registration_task):
+        if task:
+            task.cancel()
+            
+    # Persist any batched run updates
+    if run_store_flush_task:
+        run_store_flush_task.cancel()
+    run_store.close()
+        
     # Clean up temp files
     FileHandler.cleanup_temp_files()
     logger.info("Application shutdown complete")
@@ -96,10 +164,17 @@ async def health_check():
 
 @app.post("/runs", response_model=RunResponse)
 async def create_run(run_request: RunRequest, background_tasks: BackgroundTasks):
+    if run_request.quality not in ("draft", "final"):
+        raise HTTPException(status_code=400, detail="quality must be 'draft' or 'final'")
+        
     run_id = str(uuid4())
     steps = {name: "PENDING" for name in PIPELINE_STEPS}
-    run = Run(run_id=run_id, status="QUEUED", steps=steps, artifacts=[])
-    runs[run_id] = run
+    run = Run(run_id=run_id, status="QUEUED", steps=steps, artifacts=[], created_at=time.time())
+    
+    # Written through before the id is returned so any API process can serve it right away;
+    # the write runs off the event loop, since it may wait on another process's lock
+    _save_run(run)
+    await asyncio.to_thread(run_store.flush)
 
     # Start workers if not already started
     await ensure_workers_started()
@@ -111,21 +186,67 @@ async def create_run(run_request: RunRequest, background_tasks: BackgroundTasks)
 
 @app.get("/runs/{run_id}", response_model=Run)
 async def get_run_status(run_id: str):
-    run = runs.get(run_id)
+    run = _get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail="run not found")
+    
+    # Surface artifacts as stages record them, not only once the run completes
+    if run.status in ["QUEUED", "RUNNING"]:
+        run.artifacts = ArtifactManifest.get_artifact_paths(run_id)
     return run
 
+@app.get("/runs/{run_id}/artifacts")
+async def get_run_artifacts(run_id: str):
+    """Get the artifact manifest of a run (path, size, content type, checksum, stage)"""
+    if not _get_run(run_id):
+        raise HTTPException(status_code=404, detail="run not found")
+    return {"run_id": run_id, "artifacts": ArtifactManifest.load(run_id)}
+
+@app.get("/runs/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request):
+    """Stream run snapshots as Server-Sent Events until the run finishes"""
+    run = _get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="run not found")
+        
+    return StreamingResponse(
+        _run_event_stream(run_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/runs/{run_id}/render", status_code=202)
+async def render_final(run_id: str, background_tasks: BackgroundTasks):
+    """Re-render an approved run's video project at final quality"""
+    run = _get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="run not found")
+    if run.status != "COMPLETED":
+        raise HTTPException(status_code=409, detail="run has not completed")
+    # A render outliving assemble_video's budget was lost (e.g. to a restart) and may be retried
+    if run.final_render == "RENDERING" and time.time() - (run.final_render_started_at or 0) < TASK_TIMEOUTS["assemble_video"]:
+        raise HTTPException(status_code=409, detail="final render already in progress")
+    if not Config.VIDEO_RENDER_ENABLED:
+        raise HTTPException(status_code=400, detail="video rendering is disabled")
+    if not os.path.exists(FileHandler.get_output_path('video_project.json', run_id)):
+        raise HTTPException(status_code=404, detail="video project not found")
+        
+    run.final_render = "RENDERING"
+    run.final_render_started_at = time.time()
+    _save_run(run, immediate=True)
+    background_tasks.add_task(_render_final_video, run_id)
+    return {"run_id": run_id, "final_render": run.final_render}
+
 @app.post("/runs/{run_id}/terminate")
 async def terminate_run(run_id: str):
     """Terminate a running workflow"""
-    run = runs.get(run_id)
+    run = _get_run(run_id)
     if not run:
         raise HTTPException(status_code=404, detail="run not found")
     
     if run.workflow_id:
         try:
-            orkes_client.terminate_workflow(run.workflow_id)
+            await workflow_client.terminate_workflow(run.workflow_id)
             run.status = "TERMINATED"
             logger.info(f"Terminated workflow {run.workflow_id} for run {run_id}")
         except Exception as e:
@@ -134,6 +255,7 @@ async def terminate_run(run_id: str):
     else:
         run.status = "TERMINATED"
     
+    _save_run(run)
     return {"message": "Run terminated successfully"}
 
 @app.get("/artifacts/{file_path:path}")
@@ -153,23 +275,118 @@ async def serve_artifact(file_path: str):
 @app.get("/workflows/status")
 async def get_workflow_status():
     """Get status of all running workflows"""
-    active_runs = [run for run in runs.values() if run.status in ["QUEUED", "RUNNING"]]
-    completed_runs = [run for run in runs.values() if run.status == "COMPLETED"]
-    failed_runs = [run for run in runs.values() if run.status == "FAILED"]
+    # Counts are maintained on every run transition, so this never scans the runs
+    counters = run_store.get_counters()
+    status_counts = counters["statuses"]
+    
+    window_seconds = Config.THROUGHPUT_WINDOW_SECONDS
+    finished = run_store.get_throughput(window_seconds)
     
     return {
         "workers_started": workers_started,
-        "active_runs": len(active_runs),
-        "completed_runs": len(completed_runs), 
-        "failed_runs": len(failed_runs),
-        "total_runs": len(runs)
+        "active_runs": status_counts.get("QUEUED", 0) + status_counts.get("RUNNING", 0),
+        "completed_runs": status_counts.get("COMPLETED", 0), 
+        "failed_runs": status_counts.get("FAILED", 0),
+        "total_runs": sum(status_counts.values()),
+        # Runs currently in each step - shows where the pipeline is backed up
+        "stages": {step: counters["stages"].get(step, 0) for step in PIPELINE_STEPS},
+        "throughput": {
+            "window_seconds": window_seconds,
+            "completed": finished.get("COMPLETED", 0),
+            "failed": sum(count for status, count in finished.items() if status != "COMPLETED"),
+            "completed_per_minute": round(finished.get("COMPLETED", 0) * 60 / window_seconds, 2)
+        }
     }
 
+def _get_run(run_id: str) -> Optional[Run]:
+    """Load a run from the store"""
+    data = run_store.get(run_id)
+    return Run(**data) if data else None
+
+def _save_run(run: Run, immediate: bool = False):
+    """Save a run and push it to event subscribers; writes are batched, and flushed right away
+    in the background when immediate is set or the run has finished"""
+    snapshot = run.dict()
+    run_store.save(snapshot)
+    run_events.publish(run.run_id, snapshot)
+    if immediate or run.status in TERMINAL_STATUSES:
+        run_store_flush_requested.set()
+
+def _format_event(event: str, data: dict) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _run_event_stream(run_id: str, request: Request):
+    """Yield the current snapshot, then each update, with keepalives while the run is quiet"""
+    # Subscribed here so the finally below always unsubscribes (a client that drops before
+    # the body is iterated never subscribes), and before the snapshot so no update is missed
+    queue = run_events.subscribe(run_id)
+    try:
+        run = _get_run(run_id)
+        if not run:
+            return
+        if run.status in ["QUEUED", "RUNNING"]:
+            run.artifacts = ArtifactManifest.get_artifact_paths(run_id)
+        snapshot = run.dict()
+        
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        yield _format_event("run", snapshot)
+        
+        while snapshot["status"] not in TERMINAL_STATUSES:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), timeout=Config.RUN_EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield _format_event("run", snapshot)
+            
+    finally:
+        run_events.unsubscribe(run_id, queue)
+
+async def _render_final_video(run_id: str):
+    """Render the final video off the event loop and record the outcome on the run"""
+    try:
+        await asyncio.to_thread(VideoWorker().render_project, run_id, "final")
+        final_render = "COMPLETED"
+    except Exception as e:
+        logger.error(f"Final render failed for run {run_id}: {e}")
+        final_render = "FAILED"
+        
+    run = _get_run(run_id)
+    if run:
+        run.final_render = final_render
+        run.artifacts = ArtifactManifest.get_artifact_paths(run_id)
+        _save_run(run)
+        
+async def _register_workflow():
+    """Register the workflow and task definitions with the engine"""
+    try:
+        await workflow_client.register_workflow(WORKFLOW_DEFINITION, TASK_DEFINITIONS)
+    except Exception as e:
+        logger.error(f"Failed to register workflow {WORKFLOW_NAME}: {e}")
+        
+async def _flush_run_store_periodically():
+    """Write batched run updates to the store in the background"""
+    while True:
+        try:
+            await asyncio.wait_for(run_store_flush_requested.wait(), Config.RUN_STORE_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        run_store_flush_requested.clear()
+        try:
+            await asyncio.to_thread(run_store.flush)
+        except Exception as e:
+            logger.error(f"Failed to flush run store: {e}")
+
 
 async def _start_orkes_workflow(run_id: str, run_request: RunRequest):
     """Start Orkes workflow for video generation"""
     try:
-        run = runs.get(run_id)
+        run = _get_run(run_id)
         if not run:
             return
             
@@ -178,106 +395,228 @@ async def _start_orkes_workflow(run_id: str, run_request: RunRequest):
             "topic": run_request.topic,
             "duration": run_request.duration,
             "voice": run_request.voice,
+            "quality": run_request.quality,
+            "use_cache": run_request.use_cache,
             "run_id": run_id
         }
         
         # Start the real Orkes workflow
-        workflow_id = await orkes_client.start_workflow("video_generation_workflow", workflow_input)
+        workflow_id = await workflow_client.start_workflow(WORKFLOW_NAME, workflow_input, WORKFLOW_VERSION)
         run.workflow_id = workflow_id
+        workflow_runs[workflow_id] = run_id
         
         logger.info(f"Started Orkes workflow {workflow_id} for run {run_id} with topic: {run_request.topic}")
         run.status = "RUNNING"
-        
-        # Monitor the real workflow progress
-        await _monitor_workflow_progress(run_id, workflow_id)
+        # From here the reconciler and task events track the run
+        _save_run(run, immediate=True)
         
     except Exception as e:
         logger.error(f"Failed to start workflow for run {run_id}: {e}")
-        if run_id in runs:
-            runs[run_id].status = "FAILED"
+        run = _get_run(run_id)
+        if run:
+            run.status = "FAILED"
+            _save_run(run)
 
-async def _monitor_workflow_progress(run_id: str, workflow_id: str):
-    """Monitor real Orkes workflow progress"""
-    run = runs.get(run_id)
-    if not run:
-        return
+async def _reconcile_workflows():
+    """Keep every active run in line with Orkes from a single background task"""
+    while True:
+        await asyncio.sleep(Config.WORKFLOW_RECONCILE_TICK)
+        try:
+            await _reconcile_active_runs()
+        except Exception as e:
+            logger.error(f"Workflow reconciliation failed: {e}")
+
+async def _reconcile_active_runs():
+    """Fetch status for all active runs that are due, in batches, and apply it"""
+    now = time.time()
+    runs = [Run(**data) for data in await asyncio.to_thread(run_store.list_active)]
+    
+    active_ids = {run.run_id for run in runs}
+    for run_id in [run_id for run_id in reconcile_due if run_id not in active_ids]:
+        del reconcile_due[run_id]
+    for run_id in [run_id for run_id in workflow_updates if run_id not in active_ids]:
+        del workflow_updates[run_id]
+    workflow_runs.clear()
+    workflow_runs.update({run.workflow_id: run.run_id for run in runs if run.workflow_id})
+    
+    due = []
+    for run in runs:
+        if run.created_at and now - run.created_at > WORKFLOW_TIMEOUT_SECONDS:
+            logger.warning(f"Workflow monitoring timed out for run {run.run_id}")
+            run.status = "TIMEOUT"
+            _save_run(run)
+        elif run.workflow_id and reconcile_due.get(run.run_id, 0) <= now:
+            due.append(run)
+            
+    batch_size = Config.WORKFLOW_RECONCILE_BATCH_SIZE
+    for start in range(0, len(due), batch_size):
+        batch = due[start:start + batch_size]
+        statuses = await workflow_client.get_workflow_statuses([run.workflow_id for run in batch])
         
-    try:
-        max_wait_time = 10 * 60  # 10 minutes
-        poll_interval = 5  # 5 seconds
-        elapsed_time = 0
+        for run in batch:
+            workflow_status = statuses.get(run.workflow_id)
+            if workflow_status:
+                if not Config.TASK_EVENTS_ENABLED:
+                    workflow_status = await _with_changed_tasks(run.run_id, workflow_status)
+                await _apply_workflow_status(run.run_id, workflow_status)
+            reconcile_due[run.run_id] = time.time() + _reconcile_interval(run)
+            
+async def _with_changed_tasks(run_id: str, workflow_status: dict) -> dict:
+    """Without task events, fetch a running workflow's tasks only when its summary has changed"""
+    if "tasks" in workflow_status or workflow_status.get("status") != "RUNNING":
+        return workflow_status
         
-        while elapsed_time < max_wait_time:
-            try:
-                # Get workflow status from Orkes
-                workflow_status = await orkes_client.get_workflow_status(workflow_id)
-                run.orkes_status = workflow_status.get("status", "UNKNOWN")
+    update_time = workflow_status.get("updateTime")
+    if update_time is not None and workflow_updates.get(run_id) == update_time:
+        return workflow_status
+    try:
+        full_status = await workflow_client.get_workflow_status(workflow_status["workflowId"])
+    except Exception as e:
+        logger.warning(f"Could not fetch tasks of workflow for run {run_id}: {e}")
+        return workflow_status
+    workflow_updates[run_id] = update_time
+    return full_status
+
+def _reconcile_interval(run: Run) -> float:
+    """Seconds until a run is next reconciled, based on the step it is in"""
+    current_step = next(
+        (step for step in PIPELINE_STEPS if run.steps.get(step) not in ("COMPLETED", "SKIPPED")),
+        None
+    )
+    if current_step in LONG_RUNNING_STEPS:
+        return Config.WORKFLOW_RECONCILE_INTERVAL
+    return Config.WORKFLOW_RECONCILE_FAST_INTERVAL
+
+async def _apply_workflow_status(run_id: str, workflow_status: dict):
+    """Update a run from an Orkes workflow status (a full workflow or a search summary)"""
+    # Summaries have no tasks; fetch the full workflow once it finishes to settle every step
+    if "tasks" not in workflow_status and workflow_status.get("status") != "RUNNING":
+        try:
+            workflow_status = await workflow_client.get_workflow_status(workflow_status["workflowId"])
+        except Exception as e:
+            logger.warning(f"Could not fetch tasks of finished workflow for run {run_id}: {e}")
+            
+    # Re-read the run so changes made elsewhere (e.g. terminate) aren't overwritten
+    run = _get_run(run_id)
+    if not run or run.status in TERMINAL_STATUSES:
+        return
+    run.orkes_status = workflow_status.get("status", "UNKNOWN")
+    
+    # Update individual step statuses
+    if "tasks" in workflow_status:
+        for step, step_status in _aggregate_step_statuses(workflow_status["tasks"]).items():
+            # A task event may be newer than this snapshot; never undo a completion
+            if step in run.steps and run.steps[step] != "COMPLETED":
+                run.steps[step] = step_status
                 
-                # Update individual task statuses
-                if "tasks" in workflow_status:
-                    for task in workflow_status["tasks"]:
-                        task_type = task.get("taskType")
-                        task_status = task.get("status", "UNKNOWN")
-                        
-                        if task_type in run.steps:
-                            run.steps[task_type] = task_status
+    # Artifacts only matter to live subscribers until the run completes
+    if run_events.has_subscribers(run_id):
+        run.artifacts = ArtifactManifest.get_artifact_paths(run_id)
+        
+    # Check if workflow is complete
+    if run.orkes_status == "COMPLETED":
+        run.status = "COMPLETED"
+        # Find generated artifacts
+        await _collect_artifacts(run, workflow_status)
+        logger.info(f"Workflow {run.workflow_id} completed for run {run_id}")
+    elif run.orkes_status in ["FAILED", "TIMED_OUT", "TERMINATED"]:
+        run.status = "FAILED"
+        logger.error(f"Workflow {run.workflow_id} failed with status: {run.orkes_status}")
+        
+    # Batched: every run updated in this pass becomes one store write
+    _save_run(run)
+
+async def _consume_task_events():
+    """Apply task events published by workers to their runs as they arrive"""
+    last_id = None
+    polls = 0
+    
+    while True:
+        events = []
+        try:
+            if last_id is None:
+                # Only events from now on; earlier runs are covered by reconciliation
+                last_id = await asyncio.to_thread(task_events.get_latest_id)
                 
-                # Check if workflow is complete
-                if run.orkes_status == "COMPLETED":
-                    run.status = "COMPLETED"
-                    # Find generated artifacts
-                    await _collect_artifacts(run_id, workflow_status)
-                    logger.info(f"Workflow {workflow_id} completed for run {run_id}")
-                    break
-                elif run.orkes_status in ["FAILED", "TIMED_OUT", "TERMINATED"]:
-                    run.status = "FAILED"
-                    logger.error(f"Workflow {workflow_id} failed with status: {run.orkes_status}")
-                    break
+            events, last_id = await asyncio.to_thread(task_events.read_since, last_id)
+            for event in events:
+                await _apply_task_event(event)
                 
-                # Wait before next poll
-                await asyncio.sleep(poll_interval)
-                elapsed_time += poll_interval
+            polls += 1
+            if polls % 1000 == 0:
+                await asyncio.to_thread(task_events.prune)
                 
-            except Exception as poll_error:
-                logger.error(f"Error polling workflow {workflow_id}: {poll_error}")
-                await asyncio.sleep(poll_interval)
-                elapsed_time += poll_interval
+        except Exception as e:
+            logger.error(f"Failed to consume task events: {e}")
+            
+        # Keep draining while there is a backlog
+        if not events:
+            await asyncio.sleep(Config.TASK_EVENTS_POLL_INTERVAL)
+
+def _aggregate_step_statuses(tasks: List[dict]) -> Dict[str, str]:
+    """Combine workflow tasks into one status per step; per-scene tasks count toward their step"""
+    # Retries appear as later tasks with the same reference; the latest attempt wins
+    latest = {}
+    for task in tasks:
+        latest[task.get("referenceTaskName") or task.get("taskId")] = task
         
-        # Timeout handling
-        if elapsed_time >= max_wait_time:
-            logger.warning(f"Workflow monitoring timed out for run {run_id}")
-            run.status = "TIMEOUT"
+    statuses: Dict[str, List[str]] = {}
+    for task in latest.values():
+        step = get_step_name(task.get("taskType"))
+        statuses.setdefault(step, []).append(task.get("status", "UNKNOWN"))
         
-    except Exception as e:
-        logger.error(f"Workflow monitoring failed for run {run_id}: {e}")
-        run.status = "FAILED"
+    combined = {}
+    for step, task_statuses in statuses.items():
+        if any(status in ACTIVE_TASK_STATUSES for status in task_statuses):
+            combined[step] = "IN_PROGRESS"
+        else:
+            combined[step] = next(
+                (status for status in task_statuses if status not in ("COMPLETED", "SKIPPED")),
+                "COMPLETED"
+            )
+    return combined
 
-async def _collect_artifacts(run_id: str, workflow_status: dict):
-    """Collect artifacts from completed workflow"""
-    run = runs.get(run_id)
-    if not run:
+async def _apply_task_event(event: dict):
+    """Update a run's step from a worker task event"""
+    run_id = event['runId'] or workflow_runs.get(event['workflowId'])
+    run = _get_run(run_id) if run_id else None
+    step = get_step_name(event['taskType'])
+    if not run or run.status in TERMINAL_STATUSES or step not in run.steps:
         return
         
-    artifacts = []
-    
-    # Look for output files in temp directory
-    temp_dir = Config.TEMP_DIR
-    if os.path.exists(temp_dir):
-        for file_name in os.listdir(temp_dir):
-            file_path = os.path.join(temp_dir, file_name)
-            if os.path.isfile(file_path):
-                artifacts.append(f"temp/{file_name}")
-    
-    # Look for output files in output directory  
-    output_dir = Config.OUTPUT_DIR
-    if os.path.exists(output_dir):
-        for file_name in os.listdir(output_dir):
-            file_path = os.path.join(output_dir, file_name)
-            if os.path.isfile(file_path):
-                artifacts.append(f"output/{file_name}")
+    if step == event['taskType']:
+        run.steps[step] = event['status']
+    elif event['status'] != "COMPLETED" and run.steps[step] != "COMPLETED":
+        # One of many per-scene tasks finishing says nothing about the rest
+        run.steps[step] = event['status']
+        
+    if event['status'] == "IN_PROGRESS":
+        # A step only starts once every earlier group has finished
+        for group in STEP_GROUPS:
+            if step in group:
+                break
+            for earlier_step in group:
+                run.steps[earlier_step] = "COMPLETED"
+                
+    if run.status == "QUEUED":
+        run.status = "RUNNING"
+        
+    # Workers publish COMPLETED before the engine has accepted the result, so a worker event
+    # never finishes the run; the reconciler confirms with the engine on its next tick
+    if event['taskType'] == PIPELINE_STEPS[-1] and event['status'] == "COMPLETED":
+        reconcile_due[run.run_id] = 0
+        
+    if run_events.has_subscribers(run.run_id):
+        run.artifacts = ArtifactManifest.get_artifact_paths(run.run_id)
+    _save_run(run)
+
+async def _collect_artifacts(run: Run, workflow_status: dict):
+    """Collect artifacts from completed workflow"""
+    # Read the run's manifest rather than scanning the shared directories
+    artifacts = ArtifactManifest.get_artifact_paths(run.run_id)
     
     run.artifacts = artifacts
-    logger.info(f"Collected {len(artifacts)} artifacts for run {run_id}")
+    logger.info(f"Collected {len(artifacts)} artifacts for run {run.run_id}")
 
 async def ensure_workers_started():
     """Ensure Orkes workers are started"""
@@ -287,10 +626,16 @@ async def ensure_workers_started():
         logger.info("Starting Orkes workers...")
         
         # Add workers to the client
-        orkes_client.add_worker(ScriptWorker())
-        orkes_client.add_worker(ImageWorker())
-        orkes_client.add_worker(AudioWorker())
-        orkes_client.add_worker(VideoWorker())
+        workflow_client.add_worker(ScriptWorker())
+        workflow_client.add_worker(ImageWorker())
+        workflow_client.add_worker(AudioWorker())
+        workflow_client.add_worker(VideoWorker())
+        if Config.SCENE_FANOUT_ENABLED:
+            workflow_client.add_worker(ScenePlanWorker())
+            workflow_client.add_worker(SceneImageWorker())
+            workflow_client.add_worker(SceneAudioWorker())
+        if Config.SCENE_PIPELINE_ENABLED:
+            workflow_client.add_worker(ScenePipelineWorker())
         
         # Start workers in a separate thread
         worker_thread = threading.Thread(target=_start_workers_sync, daemon=True)
@@ -304,7 +649,7 @@ def _start_workers_sync():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        loop.run_until_complete(orkes_client.start_workers())
+        loop.run_until_complete(workflow_client.start_workers())
     except Exception as e:
         logger.error(f"Failed to start workers: {e}")
     finally:
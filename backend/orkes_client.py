@@ -1,10 +1,14 @@
 import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from conductor.client.automator.task_handler import TaskHandler
 from conductor.client.configuration.configuration import Configuration
 from conductor.client.orkes.orkes_workflow_client import OrkesWorkflowClient
+from conductor.client.orkes.orkes_metadata_client import OrkesMetadataClient
 from conductor.client.orkes.orkes_task_client import OrkesTaskClient
 from conductor.client.worker.worker_interface import WorkerInterface
-from config import get_conductor_config
+from typing import Dict, List, Optional
+from config import Config, get_conductor_config
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,9 +17,15 @@ class OrkesClient:
     def __init__(self):
         self.configuration = get_conductor_config()
         self.workflow_client = OrkesWorkflowClient(self.configuration)
+        self.metadata_client = OrkesMetadataClient(self.configuration)
         self.task_client = OrkesTaskClient(self.configuration)
         self.task_handler = None
         self.workers = []
+        # The SDK is blocking; its calls run here so they never stall the API event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.ORKES_MAX_CONCURRENT_CALLS,
+            thread_name_prefix="orkes-call"
+        )
         
     def add_worker(self, worker: WorkerInterface):
         """Add a worker to the client"""
@@ -48,10 +58,36 @@ class OrkesClient:
             self.task_handler.stop_processes()
             logger.info("All workers stopped")
 
+    async def register_workflow(self, definition: dict, task_definitions: Optional[List[dict]] = None):
+        """Register task definitions and create or update the workflow definition, each independently"""
+        # The SDK serializes plain dicts as-is, so definitions can stay in Conductor's JSON shape
+        task_definitions = task_definitions or []
+        results = await asyncio.gather(
+            *(self._call(self.metadata_client.register_task_def, task_definition) for task_definition in task_definitions),
+            return_exceptions=True
+        )
+        failed = []
+        for task_definition, result in zip(task_definitions, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error registering task {task_definition['name']}: {result}")
+                failed.append(task_definition['name'])
+                
+        # Task definitions that already exist on the server still let the workflow register
+        try:
+            await self._call(self.metadata_client.update_workflow_def, definition, overwrite=True)
+            logger.info(f"Registered workflow {definition['name']} v{definition.get('version', 1)}")
+        except Exception as e:
+            logger.error(f"Error registering workflow: {e}")
+            raise
+            
+        if failed:
+            raise Exception(f"Failed to register task definitions: {', '.join(failed)}")
+            
     async def start_workflow(self, workflow_name: str, input_data: dict, version: int = 1):
         """Start a workflow execution"""
         try:
-            workflow_id = self.workflow_client.execute_workflow(
+            workflow_id = await self._call(
+                self.workflow_client.execute_workflow,
                 name=workflow_name,
                 input=input_data,
                 version=version
@@ -63,21 +99,69 @@ class OrkesClient:
             raise
             
     async def get_workflow_status(self, workflow_id: str):
-        """Get workflow execution status"""
+        """Get workflow execution status as a camelCase dict ("status", "tasks": [{"taskType", ...}])"""
         try:
-            return self.workflow_client.get_workflow(workflow_id)
+            workflow = await self._call(self.workflow_client.get_workflow, workflow_id)
+            return self._to_dict(workflow)
         except Exception as e:
             logger.error(f"Error getting workflow status: {e}")
             raise
             
-    def terminate_workflow(self, workflow_id: str):
+    async def get_workflow_statuses(self, workflow_ids: List[str]) -> Dict[str, dict]:
+        """Get the status of many workflows, keyed by workflow id; workflows that can't be fetched are left out"""
+        statuses = {}
+        if workflow_ids:
+            # One search returns summaries (status, no tasks) for the whole batch
+            try:
+                query = f"workflowId IN ({','.join(workflow_ids)})"
+                result = self._to_dict(await self._call(
+                    self.workflow_client.search, start=0, size=len(workflow_ids), query=query
+                ))
+                for summary in result.get("results") or []:
+                    statuses[summary["workflowId"]] = summary
+            except Exception as e:
+                logger.warning(f"Workflow search failed, fetching {len(workflow_ids)} workflows one by one: {e}")
+                
+        # The search index can lag behind new workflows; look those up directly
+        missing = [workflow_id for workflow_id in workflow_ids if workflow_id not in statuses]
+        results = await asyncio.gather(
+            *(self.get_workflow_status(workflow_id) for workflow_id in missing),
+            return_exceptions=True
+        )
+        for workflow_id, result in zip(missing, results):
+            if not isinstance(result, Exception):
+                statuses[workflow_id] = result
+                
+        return statuses
+        
+    async def terminate_workflow(self, workflow_id: str):
         """Terminate a workflow"""
         try:
-            self.workflow_client.terminate_workflow(workflow_id, reason="Terminated by user")
+            await self._call(self.workflow_client.terminate_workflow, workflow_id, reason="Terminated by user")
             logger.info(f"Terminated workflow: {workflow_id}")
         except Exception as e:
             logger.error(f"Error terminating workflow: {e}")
             raise
+            
+    def close(self):
+        """Stop the call pool; calls still waiting are cancelled"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        
+    async def _call(self, func, *args, timeout: float = None, **kwargs):
+        """Run a blocking SDK call on the call pool, giving up after the timeout"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout or Config.ORKES_CALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            # The thread can't be interrupted, but the caller and the event loop move on
+            raise TimeoutError(f"Orkes call {getattr(func, '__name__', func)} timed out")
+            
+    def _to_dict(self, model) -> dict:
+        """Convert an SDK model to the JSON shape the Conductor API returns"""
+        if isinstance(model, dict):
+            return model
+        return self.workflow_client.api_client.sanitize_for_serialization(model)
 
 # Global client instance
 orkes_client = OrkesClient()
\ No newline at end of file
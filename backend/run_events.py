@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RunEventBroadcaster:
+    """In-process fan-out of run snapshots to event stream subscribers (call from the API event loop)"""
+    
+    def __init__(self, queue_size: int = None):
+        self.queue_size = queue_size or Config.RUN_EVENTS_QUEUE_SIZE
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_snapshots: Dict[str, dict] = {}
+        
+    def subscribe(self, run_id: str) -> asyncio.Queue:
+        """Register a subscriber for a run and get the queue its events arrive on"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+        
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue):
+        """Remove a subscriber; state for the run is dropped with its last subscriber"""
+        subscribers = self._subscribers.get(run_id)
+        if not subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[run_id]
+            self._last_snapshots.pop(run_id, None)
+            
+    def has_subscribers(self, run_id: str) -> bool:
+        """Check whether anyone is listening to a run"""
+        return run_id in self._subscribers
+        
+    def publish(self, run_id: str, snapshot: dict):
+        """Send a run snapshot to its subscribers, skipping it if nothing changed"""
+        subscribers = self._subscribers.get(run_id)
+        if not subscribers or self._last_snapshots.get(run_id) == snapshot:
+            return
+        self._last_snapshots[run_id] = snapshot
+        
+        # Events are full snapshots, so a slow subscriber only needs the newest one
+        for queue in subscribers:
+            if queue.full():
+                # Superseded by the snapshot being published
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+            
+    def subscriber_count(self, run_id: Optional[str] = None) -> int:
+        """Count subscribers of one run, or of all runs"""
+        if run_id is not None:
+            return len(self._subscribers.get(run_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
@@ -0,0 +1,349 @@
+import os
+import copy
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("COMPLETED", "FAILED", "TIMEOUT", "TERMINATED")
+ACTIVE_STATUSES = ("QUEUED", "RUNNING")
+ACTIVE_STEP_STATUSES = ("SCHEDULED", "IN_PROGRESS")
+
+def _counter_names(run: Optional[dict]) -> List[str]:
+    """Counters a run contributes to: its status, plus the stages it is currently in"""
+    if not run:
+        return []
+    names = [f"status:{run['status']}"]
+    if run['status'] not in TERMINAL_STATUSES:
+        names += [
+            f"stage:{step}"
+            for step, step_status in (run.get('steps') or {}).items()
+            if step_status in ACTIVE_STEP_STATUSES
+        ]
+    return names
+
+def _count_deltas(old: Optional[dict], new: Optional[dict]) -> Dict[str, int]:
+    """Counter changes caused by replacing `old` with `new` (None meaning absent)"""
+    deltas: Dict[str, int] = {}
+    for name in _counter_names(old):
+        deltas[name] = deltas.get(name, 0) - 1
+    for name in _counter_names(new):
+        deltas[name] = deltas.get(name, 0) + 1
+    return {name: delta for name, delta in deltas.items() if delta}
+
+def _finished_status(old: Optional[dict], new: dict) -> Optional[str]:
+    """The terminal status `new` just transitioned into, if any"""
+    if new['status'] in TERMINAL_STATUSES and (not old or old['status'] != new['status']):
+        return new['status']
+    return None
+
+def _split_counters(counters: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+    """Group a flat counter map into per-status and per-stage counts"""
+    grouped = {"statuses": {}, "stages": {}}
+    for name, value in counters.items():
+        kind, _, key = name.partition(":")
+        if value and kind == "status":
+            grouped["statuses"][key] = value
+        elif value and kind == "stage":
+            grouped["stages"][key] = value
+    return grouped
+
+def _bucket(timestamp: float) -> int:
+    """Start of the throughput bucket containing timestamp"""
+    return int(timestamp // Config.THROUGHPUT_BUCKET_SECONDS) * Config.THROUGHPUT_BUCKET_SECONDS
+
+class RunStore(ABC):
+    """Storage for run records (plain dicts of the API's Run model)"""
+    
+    @abstractmethod
+    def get(self, run_id: str) -> Optional[dict]:
+        """Get a run by id"""
+        pass
+        
+    @abstractmethod
+    def save(self, run: dict):
+        """Save a run; writes may be batched until the next flush"""
+        pass
+        
+    @abstractmethod
+    def list_active(self) -> List[dict]:
+        """Get all runs that are queued or running"""
+        pass
+        
+    @abstractmethod
+    def get_counters(self) -> Dict[str, Dict[str, int]]:
+        """Get maintained counts: {'statuses': {...}, 'stages': {...}}"""
+        pass
+        
+    @abstractmethod
+    def get_throughput(self, window_seconds: int) -> Dict[str, int]:
+        """Get how many runs finished in each terminal status over the trailing window"""
+        pass
+        
+    def count_by_status(self) -> Dict[str, int]:
+        """Get the number of runs in each status"""
+        return self.get_counters()["statuses"]
+        
+    def flush(self):
+        """Persist any batched writes"""
+        pass
+        
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+class InMemoryRunStore(RunStore):
+    """Process-local store that keeps at most max_runs, evicting the oldest finished runs"""
+    
+    def __init__(self, max_runs: int = None):
+        self.max_runs = max_runs or Config.RUN_STORE_MAX_RUNS
+        self._runs: "OrderedDict[str, dict]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._finished: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        
+    def get(self, run_id: str) -> Optional[dict]:
+        with self._lock:
+            run = self._runs.get(run_id)
+            return copy.deepcopy(run) if run else None
+            
+    def save(self, run: dict):
+        with self._lock:
+            old = self._runs.get(run['run_id'])
+            self._runs[run['run_id']] = copy.deepcopy(run)
+            self._apply_deltas(_count_deltas(old, run))
+            
+            finished_status = _finished_status(old, run)
+            if finished_status:
+                bucket = self._finished.setdefault(_bucket(time.time()), {})
+                bucket[finished_status] = bucket.get(finished_status, 0) + 1
+                
+            self._evict()
+            
+    def list_active(self) -> List[dict]:
+        with self._lock:
+            return [copy.deepcopy(run) for run in self._runs.values() if run['status'] in ACTIVE_STATUSES]
+            
+    def get_counters(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return _split_counters(self._counters)
+            
+    def get_throughput(self, window_seconds: int) -> Dict[str, int]:
+        with self._lock:
+            # Drop buckets that have left the window; at most window / bucket size remain
+            cutoff = _bucket(time.time() - window_seconds)
+            for bucket in [bucket for bucket in self._finished if bucket < cutoff]:
+                del self._finished[bucket]
+                
+            totals: Dict[str, int] = {}
+            for counts in self._finished.values():
+                for status, count in counts.items():
+                    totals[status] = totals.get(status, 0) + count
+            return totals
+            
+    def _apply_deltas(self, deltas: Dict[str, int]):
+        """Apply counter changes"""
+        for name, delta in deltas.items():
+            self._counters[name] = self._counters.get(name, 0) + delta
+            
+    def _evict(self):
+        """Drop the oldest finished runs once over capacity; active runs are never evicted"""
+        if len(self._runs) <= self.max_runs:
+            return
+            
+        for run_id in list(self._runs.keys()):
+            if len(self._runs) <= self.max_runs:
+                break
+            run = self._runs[run_id]
+            if run['status'] in TERMINAL_STATUSES:
+                del self._runs[run_id]
+                self._apply_deltas(_count_deltas(run, None))
+
+class SQLiteRunStore(RunStore):
+    """Durable store shared by API processes on one host, with batched status writes"""
+    
+    def __init__(self, path: str = None):
+        self.path = path or Config.RUN_STORE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+        # Autocommit mode; transactions are opened explicitly around batched writes. Reads and writes
+        # use separate connections, so a write waiting on another process's lock never holds up a read
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._write_conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, dict] = {}
+        # Runs taken from _pending by the flush in progress, still visible to reads until committed
+        self._flushing: Dict[str, dict] = {}
+        self._create_schema()
+        
+    def _create_schema(self):
+        """Create tables and indexes, and enable WAL so readers never block the writer"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for conn in (self._conn, self._write_conn):
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status);
+                CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at);
+                
+                -- Aggregates maintained on every write, so counts never scan runs
+                CREATE TABLE IF NOT EXISTS run_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                );
+                
+                -- Runs finished per time bucket, for windowed throughput
+                CREATE TABLE IF NOT EXISTS run_throughput (
+                    bucket INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (bucket, status)
+                );
+            """)
+            
+    def get(self, run_id: str) -> Optional[dict]:
+        with self._lock:
+            # Batched writes from this process are visible to its own reads
+            pending = self._pending.get(run_id) or self._flushing.get(run_id)
+            if pending:
+                return copy.deepcopy(pending)
+            row = self._conn.execute("SELECT data FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+        
+    def save(self, run: dict):
+        with self._lock:
+            # Repeated updates to one run within a batch collapse into a single write
+            self._pending[run['run_id']] = copy.deepcopy(run)
+            
+    def flush(self):
+        """Write all batched runs and their counter changes in one transaction"""
+        # Only the batch is swapped under the read lock; the transaction, which can wait up to the
+        # busy timeout on another process, runs outside it, one flush at a time
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending = self._pending
+                self._pending = {}
+                self._flushing = pending
+                
+            try:
+                now = time.time()
+                deltas: Dict[str, int] = {}
+                finished: Dict[str, int] = {}
+                
+                # IMMEDIATE takes the write lock up front, so the old rows read here can't change
+                self._write_conn.execute("BEGIN IMMEDIATE")
+                for run_id, run in pending.items():
+                    row = self._write_conn.execute("SELECT data FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+                    old = json.loads(row[0]) if row else None
+                    for name, delta in _count_deltas(old, run).items():
+                        deltas[name] = deltas.get(name, 0) + delta
+                    finished_status = _finished_status(old, run)
+                    if finished_status:
+                        finished[finished_status] = finished.get(finished_status, 0) + 1
+                    
+                    self._write_conn.execute(
+                        """
+                        INSERT INTO runs (run_id, status, created_at, updated_at, data)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (run_id) DO UPDATE SET
+                            status = excluded.status,
+                            updated_at = excluded.updated_at,
+                            data = excluded.data
+                        """,
+                        (run_id, run['status'], run.get('created_at') or now, now, json.dumps(run))
+                    )
+                
+                self._write_conn.executemany(
+                    """
+                    INSERT INTO run_counters (name, value) VALUES (?, ?)
+                    ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+                    """,
+                    [(name, delta) for name, delta in deltas.items() if delta]
+                )
+                self._write_conn.executemany(
+                    """
+                    INSERT INTO run_throughput (bucket, status, count) VALUES (?, ?, ?)
+                    ON CONFLICT (bucket, status) DO UPDATE SET count = count + excluded.count
+                    """,
+                    [(_bucket(now), status, count) for status, count in finished.items()]
+                )
+                if finished:
+                    self._write_conn.execute(
+                        "DELETE FROM run_throughput WHERE bucket < ?",
+                        (_bucket(now - Config.THROUGHPUT_RETENTION_SECONDS),)
+                    )
+                self._write_conn.execute("COMMIT")
+                
+            except Exception as e:
+                if self._write_conn.in_transaction:
+                    self._write_conn.execute("ROLLBACK")
+                # Keep the batch for the next flush, behind anything newer saved meanwhile
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                    self._flushing = {}
+                logger.error(f"Failed to flush {len(pending)} runs to {self.path}: {e}")
+                return
+                
+            with self._lock:
+                self._flushing = {}
+                
+    def list_active(self) -> List[dict]:
+        with self._lock:
+            placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+            rows = self._conn.execute(
+                f"SELECT run_id, data FROM runs WHERE status IN ({placeholders})", ACTIVE_STATUSES
+            ).fetchall()
+            runs = {run_id: json.loads(data) for run_id, data in rows}
+            # Batched writes are newer than their rows
+            for run_id, run in {**self._flushing, **self._pending}.items():
+                runs[run_id] = copy.deepcopy(run)
+        return [run for run in runs.values() if run['status'] in ACTIVE_STATUSES]
+        
+    def get_counters(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            # One row per status and stage, independent of how many runs exist
+            rows = self._conn.execute("SELECT name, value FROM run_counters").fetchall()
+        return _split_counters(dict(rows))
+        
+    def get_throughput(self, window_seconds: int) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, SUM(count) FROM run_throughput WHERE bucket >= ? GROUP BY status",
+                (_bucket(time.time() - window_seconds),)
+            ).fetchall()
+        return {status: total for status, total in rows}
+        
+    def close(self):
+        self.flush()
+        with self._flush_lock, self._lock:
+            self._conn.close()
+            self._write_conn.close()
+
+def create_run_store() -> RunStore:
+    """Create the run store selected by Config.RUN_STORE_BACKEND"""
+    backend = Config.RUN_STORE_BACKEND
+    if backend == "sqlite":
+        logger.info(f"Using SQLite run store at {Config.RUN_STORE_PATH}")
+        return SQLiteRunStore()
+    if backend == "memory":
+        return InMemoryRunStore()
+    raise Exception(f"Unknown RUN_STORE_BACKEND '{backend}', expected 'memory' or 'sqlite'")
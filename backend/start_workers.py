@@ -20,7 +20,11 @@ async def start_workers():
     
     try:
         from orkes_client import orkes_client
-        from workers import ScriptWorker, ImageWorker, AudioWorker, VideoWorker
+        from workers import (
+            ScriptWorker, ImageWorker, AudioWorker, VideoWorker,
+            ScenePlanWorker, SceneImageWorker, SceneAudioWorker, ScenePipelineWorker
+        )
+        from config import Config
         
         print("[INFO] Importing workers...")
         
@@ -38,6 +42,16 @@ async def start_workers():
         orkes_client.add_worker(audio_worker)
         orkes_client.add_worker(video_worker)
         
+        # Per-scene tasks let extra worker replicas share a single long video
+        if Config.SCENE_FANOUT_ENABLED:
+            orkes_client.add_worker(ScenePlanWorker())
+            orkes_client.add_worker(SceneImageWorker())
+            orkes_client.add_worker(SceneAudioWorker())
+            
+        # One task takes every scene through all stages, so no stage waits on the slowest scene
+        if Config.SCENE_PIPELINE_ENABLED:
+            orkes_client.add_worker(ScenePipelineWorker())
+        
         print(f"[OK] Added {len(orkes_client.workers)} workers to Orkes client")
         print("[INFO] Worker task definitions:")
         for worker in orkes_client.workers:
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+from run_store import InMemoryRunStore, SQLiteRunStore, _count_deltas, _finished_status, _split_counters
+
+def make_run(run_id: str, status: str = "RUNNING", **steps) -> dict:
+    return {"run_id": run_id, "status": status, "created_at": 1.0, "steps": steps}
+
+class CounterTest(unittest.TestCase):
+    def test_deltas_move_status_and_active_stages(self):
+        queued = make_run("a", "QUEUED")
+        running = make_run("a", "RUNNING", generate_script="COMPLETED", generate_images="IN_PROGRESS")
+
+        self.assertEqual(_count_deltas(None, queued), {"status:QUEUED": 1})
+        self.assertEqual(
+            _count_deltas(queued, running),
+            {"status:QUEUED": -1, "status:RUNNING": 1, "stage:generate_images": 1}
+        )
+        self.assertEqual(_count_deltas(running, running), {})
+        self.assertEqual(_count_deltas(running, None), {"status:RUNNING": -1, "stage:generate_images": -1})
+
+    def test_finished_runs_leave_their_stages(self):
+        running = make_run("a", "RUNNING", generate_images="IN_PROGRESS")
+        failed = make_run("a", "FAILED", generate_images="IN_PROGRESS")
+        self.assertEqual(
+            _count_deltas(running, failed),
+            {"status:RUNNING": -1, "status:FAILED": 1, "stage:generate_images": -1}
+        )
+
+    def test_finished_status_counts_each_transition_once(self):
+        self.assertIsNone(_finished_status(None, make_run("a", "RUNNING")))
+        self.assertEqual(_finished_status(None, make_run("a", "FAILED")), "FAILED")
+        self.assertEqual(_finished_status(make_run("a", "RUNNING"), make_run("a", "COMPLETED")), "COMPLETED")
+        self.assertIsNone(_finished_status(make_run("a", "COMPLETED"), make_run("a", "COMPLETED")))
+
+    def test_split_drops_empty_counters(self):
+        self.assertEqual(
+            _split_counters({"status:RUNNING": 2, "status:QUEUED": 0, "stage:generate_audio": 1, "stage:generate_images": 0}),
+            {"statuses": {"RUNNING": 2}, "stages": {"generate_audio": 1}}
+        )
+
+class InMemoryRunStoreTest(unittest.TestCase):
+    def test_evicts_oldest_finished_runs_first(self):
+        store = InMemoryRunStore(max_runs=2)
+        store.save(make_run("a", "COMPLETED"))
+        store.save(make_run("b", "RUNNING"))
+        store.save(make_run("c", "FAILED"))
+
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.get("c")["status"], "FAILED")
+        self.assertEqual(store.count_by_status(), {"RUNNING": 1, "FAILED": 1})
+
+    def test_never_evicts_active_runs(self):
+        store = InMemoryRunStore(max_runs=1)
+        store.save(make_run("a", "QUEUED"))
+        store.save(make_run("b", "RUNNING"))
+
+        self.assertEqual(sorted(run["run_id"] for run in store.list_active()), ["a", "b"])
+        self.assertEqual(store.count_by_status(), {"QUEUED": 1, "RUNNING": 1})
+
+        # Once one finishes it is the only candidate, and the store shrinks back to capacity
+        store.save(make_run("a", "COMPLETED"))
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.count_by_status(), {"RUNNING": 1})
+
+    def test_status_counts_follow_updates(self):
+        store = InMemoryRunStore(max_runs=10)
+        store.save(make_run("a", "QUEUED"))
+        store.save(make_run("a", "RUNNING"))
+        store.save(make_run("a", "RUNNING"))
+        self.assertEqual(store.count_by_status(), {"RUNNING": 1})
+
+        store.save(make_run("a", "COMPLETED"))
+        self.assertEqual(store.count_by_status(), {"COMPLETED": 1})
+
+    def test_stage_counts_and_throughput(self):
+        store = InMemoryRunStore(max_runs=10)
+        store.save(make_run("a", "RUNNING", generate_script="IN_PROGRESS"))
+        store.save(make_run("b", "RUNNING", generate_script="IN_PROGRESS"))
+        store.save(make_run("a", "RUNNING", generate_script="COMPLETED", generate_images="SCHEDULED"))
+        self.assertEqual(store.get_counters()["stages"], {"generate_script": 1, "generate_images": 1})
+
+        store.save(make_run("a", "COMPLETED"))
+        store.save(make_run("a", "COMPLETED"))
+        store.save(make_run("b", "FAILED"))
+        self.assertEqual(store.get_counters()["stages"], {})
+        self.assertEqual(store.get_throughput(3600), {"COMPLETED": 1, "FAILED": 1})
+
+class SQLiteRunStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "runs.db")
+        self.store = SQLiteRunStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_batched_writes_are_visible_before_flush(self):
+        self.store.save(make_run("a", "QUEUED"))
+        self.assertEqual(self.store.get("a")["status"], "QUEUED")
+        self.assertEqual([run["run_id"] for run in self.store.list_active()], ["a"])
+        # Counters only move when the batch is written
+        self.assertEqual(self.store.count_by_status(), {})
+
+        self.store.flush()
+        self.assertEqual(self.store.count_by_status(), {"QUEUED": 1})
+
+    def test_updates_within_a_batch_count_once(self):
+        self.store.save(make_run("a", "QUEUED"))
+        self.store.flush()
+        self.store.save(make_run("a", "RUNNING"))
+        self.store.save(make_run("a", "COMPLETED"))
+        self.store.save(make_run("b", "RUNNING"))
+        self.store.flush()
+
+        self.assertEqual(self.store.count_by_status(), {"COMPLETED": 1, "RUNNING": 1})
+        self.assertEqual([run["run_id"] for run in self.store.list_active()], ["b"])
+
+    def test_counts_survive_reopening(self):
+        self.store.save(make_run("a", "RUNNING"))
+        self.store.close()
+        self.store = SQLiteRunStore(self.path)
+
+        self.assertEqual(self.store.get("a")["status"], "RUNNING")
+        self.assertEqual(self.store.count_by_status(), {"RUNNING": 1})
+
+    def test_failed_flush_keeps_the_batch(self):
+        self.store.save(make_run("a", "RUNNING"))
+        # Another connection holding the write lock makes this flush fail once its busy timeout passes
+        blocker = SQLiteRunStore(self.path)
+        blocker._write_conn.execute("PRAGMA busy_timeout = 0")
+        self.store._write_conn.execute("PRAGMA busy_timeout = 0")
+        blocker._write_conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.store.flush()
+            self.store.save(make_run("b", "QUEUED"))
+            self.assertEqual(self.store.count_by_status(), {})
+            self.assertEqual(self.store.get("a")["status"], "RUNNING")
+        finally:
+            blocker._write_conn.execute("ROLLBACK")
+            blocker.close()
+
+        self.store.flush()
+        self.assertEqual(self.store.count_by_status(), {"RUNNING": 1, "QUEUED": 1})
+
+    def test_stage_counts_and_throughput(self):
+        self.store.save(make_run("a", "RUNNING", generate_script="IN_PROGRESS"))
+        self.store.flush()
+        self.assertEqual(self.store.get_counters()["stages"], {"generate_script": 1})
+
+        self.store.save(make_run("a", "RUNNING", generate_script="COMPLETED", generate_images="IN_PROGRESS"))
+        self.store.save(make_run("a", "COMPLETED"))
+        self.store.flush()
+        self.store.save(make_run("a", "COMPLETED"))
+        self.store.flush()
+        self.assertEqual(self.store.get_counters(), {"statuses": {"COMPLETED": 1}, "stages": {}})
+        self.assertEqual(self.store.get_throughput(3600), {"COMPLETED": 1})
+
+if __name__ == "__main__":
+    unittest.main()
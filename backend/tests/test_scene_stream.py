@@ -0,0 +1,107 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from utils.scene_stream import SceneStreamParser
+from utils.scene_log import SceneLog
+from config import Config
+
+SCRIPT = {
+    "title": "Braces } and [brackets] in a \"quoted\" title",
+    "totalDuration": 12,
+    "scenes": [
+        {
+            "startTime": 0,
+            "duration": 4,
+            "text": "Say \"hi\" \\ then {wave}",
+            "visualDescription": "A sign reading ]}{[",
+            "meta": {"tags": ["a", "b"], "nested": {"x": 1}}
+        },
+        {"startTime": 4, "duration": 4, "text": "Escaped \\\" quote and \\n newline", "visualDescription": "été"},
+        {"startTime": 8, "duration": 4, "text": "\"scenes\": [{\"fake\": 1}]", "visualDescription": "End"}
+    ]
+}
+
+class SceneStreamParserTest(unittest.TestCase):
+    def test_byte_by_byte_matches_full_parse(self):
+        text = json.dumps(SCRIPT, indent=2)
+        parser = SceneStreamParser()
+        emitted = []
+        for position, char in enumerate(text):
+            for index, scene in parser.feed(char):
+                emitted.append((index, scene, position))
+
+        self.assertEqual([(index, scene) for index, scene, _ in emitted], list(enumerate(SCRIPT["scenes"])))
+        # Each scene is emitted on the character that closes it, before the rest of the script arrives
+        for _, scene, position in emitted:
+            self.assertEqual(text[position], "}")
+        self.assertLess(emitted[0][2], text.index('"startTime": 4'))
+
+    def test_any_chunking_gives_the_same_scenes(self):
+        text = json.dumps(SCRIPT)
+        for size in (1, 2, 3, 7, 16, len(text)):
+            parser = SceneStreamParser()
+            scenes = []
+            for start in range(0, len(text), size):
+                scenes += parser.feed(text[start:start + size])
+            self.assertEqual(scenes, list(enumerate(SCRIPT["scenes"])), f"chunk size {size}")
+
+    def test_scenes_key_inside_a_string_is_ignored(self):
+        parser = SceneStreamParser()
+        scenes = parser.feed('{"title": "\\"scenes\\": [{\\"a\\": 1}]", "other": [{"b": 2}], "scenes": [{"c": 3}]}')
+        self.assertEqual(scenes, [(0, {"c": 3})])
+
+    def test_malformed_scene_is_skipped_but_keeps_its_index(self):
+        parser = SceneStreamParser()
+        scenes = parser.feed('{"scenes": [{"a": 1}, {"b": 01}, {"c": 3}]}')
+        self.assertEqual(scenes, [(0, {"a": 1}), (2, {"c": 3})])
+
+class SceneLogReadTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_output_dir = Config.OUTPUT_DIR
+        Config.OUTPUT_DIR = self.output_dir
+        self.path = os.path.join(self.output_dir, "run-1", "scenes.jsonl")
+        os.makedirs(os.path.dirname(self.path))
+
+    def tearDown(self):
+        Config.OUTPUT_DIR = self.original_output_dir
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def write(self, content: str):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_missing_log_has_no_scenes(self):
+        self.assertEqual(SceneLog.read("run-2"), ([], None))
+
+    def test_partially_written_last_line_is_ignored(self):
+        first = json.dumps({"sceneIndex": 0, "text": "one"})
+        second = json.dumps({"sceneIndex": 1, "text": "two"})
+        self.write(first + "\n" + second[:len(second) // 2])
+        self.assertEqual(SceneLog.read("run-1"), ([{"text": "one"}], None))
+
+        # Even a partial line that happens to be valid JSON waits for its newline
+        self.write(first + "\n" + second)
+        self.assertEqual(SceneLog.read("run-1"), ([{"text": "one"}], None))
+
+        self.write(first + "\n" + second + "\n")
+        self.assertEqual(SceneLog.read("run-1"), ([{"text": "one"}, {"text": "two"}], None))
+
+    def test_scenes_stop_at_the_first_gap(self):
+        lines = [{"sceneIndex": 0, "text": "one"}, {"sceneIndex": 2, "text": "three"}]
+        self.write("".join(json.dumps(line) + "\n" for line in lines))
+        self.assertEqual(SceneLog.read("run-1"), ([{"text": "one"}], None))
+
+    def test_final_log_round_trips(self):
+        SceneLog.append("run-1", 0, {"text": "streamed"})
+        self.assertEqual(SceneLog.read("run-1"), ([{"text": "streamed"}], None))
+
+        SceneLog.write_final("run-1", {"title": "T", "totalDuration": 8, "scenes": SCRIPT["scenes"][:2]}, "generate_script")
+        scenes, final = SceneLog.read("run-1")
+        self.assertEqual(scenes, SCRIPT["scenes"][:2])
+        self.assertEqual(final, {"done": True, "title": "T", "totalDuration": 8, "scenesCount": 2})
+
+if __name__ == "__main__":
+    unittest.main()
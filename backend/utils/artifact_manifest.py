@@ -0,0 +1,92 @@
+import os
+import json
+import hashlib
+import logging
+import mimetypes
+from datetime import datetime
+from typing import List, Optional
+from utils.file_handler import FileHandler
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.jsonl'
+
+class ArtifactManifest:
+    """Append-only per-run record of the artifacts each stage produced"""
+    
+    @staticmethod
+    def get_manifest_path(run_id: str) -> str:
+        """Get the manifest path for a run"""
+        return FileHandler.get_output_path(MANIFEST_FILENAME, run_id)
+        
+    @staticmethod
+    def record(run_id: Optional[str], filepath: str, stage: str, data: Optional[bytes] = None) -> Optional[dict]:
+        """Append an artifact entry (path, size, content type, checksum, stage) to the run's manifest"""
+        if not run_id:
+            return None
+            
+        try:
+            entry = {
+                'path': filepath.replace(os.sep, '/'),
+                'size': len(data) if data is not None else os.path.getsize(filepath),
+                'contentType': mimetypes.guess_type(filepath)[0] or 'application/octet-stream',
+                'sha256': ArtifactManifest._checksum(filepath, data),
+                'stage': stage,
+                'createdAt': datetime.now().isoformat()
+            }
+            
+            # One O_APPEND write per line keeps concurrent writers from interleaving entries
+            line = (json.dumps(entry) + '\n').encode('utf-8')
+            fd = os.open(ArtifactManifest.get_manifest_path(run_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+                
+            return entry
+            
+        except Exception as e:
+            # A missing manifest entry must never fail the stage that produced the file
+            logger.error(f"Failed to record artifact {filepath} for run {run_id}: {e}")
+            return None
+            
+    @staticmethod
+    def load(run_id: str) -> List[dict]:
+        """Load a run's artifact entries, keeping the latest entry per path in first-seen order"""
+        # Read-only lookup: don't create directories for unknown runs
+        manifest_path = os.path.join(Config.OUTPUT_DIR, FileHandler._validate_run_id(run_id), MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return []
+            
+        entries = {}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed manifest line for run {run_id}")
+                    continue
+                entries[entry['path']] = entry
+                
+        return list(entries.values())
+        
+    @staticmethod
+    def get_artifact_paths(run_id: str) -> List[str]:
+        """Get the paths of a run's artifacts as served under /artifacts"""
+        return [entry['path'] for entry in ArtifactManifest.load(run_id)]
+        
+    @staticmethod
+    def _checksum(filepath: str, data: Optional[bytes] = None) -> str:
+        """SHA-256 of the artifact, from memory when the bytes are at hand"""
+        if data is not None:
+            return hashlib.sha256(data).hexdigest()
+            
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -0,0 +1,203 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows; eviction there is unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class ContentCache:
+    """Disk cache of generated files, addressed by a hash of what produced them, evicted LRU under a byte budget"""
+    
+    def __init__(self, directory: str, max_bytes: int, extension: str = ''):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Stable key for the inputs that determine a file's content"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+        
+    def get(self, key: str, dest_path: str) -> bool:
+        """Link the cached file for key to dest_path; False on a miss"""
+        path = self._path(key)
+        try:
+            self._link(path, dest_path)
+            # Eviction goes by mtime, so a hit marks the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return False
+            
+        self._count(hit=True)
+        return True
+        
+    def read(self, key: str) -> Optional[bytes]:
+        """Get the cached content for key; None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+            
+        self._count(hit=True)
+        return content
+        
+    def put(self, key: str, content: bytes) -> Optional[str]:
+        """Store content under key and evict old entries beyond the budget; never raises"""
+        if len(content) > self.max_bytes:
+            return None
+            
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            
+            # Write then rename, so readers never link a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+            
+            self._add_size(len(content) - replaced)
+            return path
+            
+        except Exception as e:
+            logger.error(f"Failed to cache {key}: {e}")
+            return None
+            
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock on key across processes, so only one of them produces its content"""
+        lock_dir = os.path.join(self.directory, '.locks')
+        os.makedirs(lock_dir, exist_ok=True)
+        lock_path = os.path.join(lock_dir, key)
+        while True:
+            lock_file = open(lock_path, 'a')
+            if not fcntl:
+                break
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # The holder before us may have removed the file; a lock on a removed file excludes no one
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+            
+        try:
+            yield
+        finally:
+            # Removed while still held, so lock files don't pile up one per key
+            if fcntl:
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+            lock_file.close()
+                    
+    def stats(self) -> dict:
+        """Hit and miss counts of this process"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / total * 100) if total else 0
+        }
+        
+    def _path(self, key: str) -> str:
+        """Where the entry for key lives"""
+        return os.path.join(self.directory, f"{key}{self.extension}")
+        
+    def _count(self, hit: bool):
+        """Update the hit/miss counters"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                
+    def _link(self, path: str, dest_path: str):
+        """Hardlink path to dest_path, copying when the two are on different filesystems"""
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(path, dest_path)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            shutil.copyfile(path, dest_path)
+            
+    def _add_size(self, delta: int):
+        """Add to the running size total kept in the index file, evicting only once it exceeds the budget"""
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                total = self._read_size()
+                # No index yet (or a corrupt one); count the directory once to start it
+                total = self._evict_locked(evict=False) if total is None else total + delta
+                if total > self.max_bytes:
+                    total = self._evict_locked()
+                self._write_size(total)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    
+    def _read_size(self) -> Optional[int]:
+        """Running size total from the index file; None when there is none"""
+        try:
+            with open(os.path.join(self.directory, '.size')) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+            
+    def _write_size(self, total: int):
+        """Store the running size total in the index file"""
+        with open(os.path.join(self.directory, '.size'), 'w') as f:
+            f.write(str(max(0, total)))
+            
+    def _evict_locked(self, evict: bool = True) -> int:
+        """Delete least recently used entries until the cache fits its budget; returns the size left"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith('.') or entry.name.endswith('.tmp') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+                
+        if not evict or total <= self.max_bytes:
+            return total
+            
+        for _, size, path in sorted(entries):
+            try:
+                # Runs that already linked the entry keep their copy
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+            if total <= self.max_bytes:
+                break
+        return total
@@ -16,16 +16,41 @@ class FileHandler:
         os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
         
     @staticmethod
-    def get_temp_path(filename: str) -> str:
-        """Get full path for temp file"""
+    def get_run_temp_dir(run_id: Optional[str] = None) -> str:
+        """Get the temp directory for a run (the shared temp dir when no run_id is given)"""
         FileHandler.ensure_directories()
-        return os.path.join(Config.TEMP_DIR, filename)
+        if not run_id:
+            return Config.TEMP_DIR
+        run_dir = os.path.join(Config.TEMP_DIR, FileHandler._validate_run_id(run_id))
+        os.makedirs(run_dir, exist_ok=True)
+        return run_dir
         
     @staticmethod
-    def get_output_path(filename: str) -> str:
-        """Get full path for output file"""
+    def get_run_output_dir(run_id: Optional[str] = None) -> str:
+        """Get the output directory for a run (the shared output dir when no run_id is given)"""
         FileHandler.ensure_directories()
-        return os.path.join(Config.OUTPUT_DIR, filename)
+        if not run_id:
+            return Config.OUTPUT_DIR
+        run_dir = os.path.join(Config.OUTPUT_DIR, FileHandler._validate_run_id(run_id))
+        os.makedirs(run_dir, exist_ok=True)
+        return run_dir
+        
+    @staticmethod
+    def get_temp_path(filename: str, run_id: Optional[str] = None) -> str:
+        """Get full path for temp file, namespaced by run when run_id is given"""
+        return os.path.join(FileHandler.get_run_temp_dir(run_id), filename)
+        
+    @staticmethod
+    def get_output_path(filename: str, run_id: Optional[str] = None) -> str:
+        """Get full path for output file, namespaced by run when run_id is given"""
+        return os.path.join(FileHandler.get_run_output_dir(run_id), filename)
+        
+    @staticmethod
+    def _validate_run_id(run_id: str) -> str:
+        """Reject run ids that could escape the artifact directories"""
+        if run_id in ('.', '..') or '/' in run_id or '\\' in run_id:
+            raise Exception(f"Invalid run_id for artifact path: {run_id!r}")
+        return run_id
         
     @staticmethod
     async def save_json(data: Any, filepath: str) -> str:
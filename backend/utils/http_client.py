@@ -0,0 +1,71 @@
+import asyncio
+import os
+import logging
+from typing import Optional
+import httpx
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class HttpClient:
+    """Process-wide pooled async HTTP client shared by all provider calls"""
+    
+    _client: Optional[httpx.AsyncClient] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _pid: Optional[int] = None
+    
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Return the shared client, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        
+        # An AsyncClient is tied to the loop (and process) that opened its connections
+        if cls._client is None or cls._loop is not loop or cls._pid != os.getpid():
+            cls._client = cls._create_client()
+            cls._loop = loop
+            cls._pid = os.getpid()
+            logger.info("Created pooled HTTP client")
+            
+        return cls._client
+        
+    @classmethod
+    async def close(cls):
+        """Close the shared client and release its pooled connections"""
+        client = cls._client
+        if client is None or cls._pid != os.getpid():
+            return
+            
+        cls._client = None
+        cls._loop = None
+        cls._pid = None
+        
+        try:
+            await client.aclose()
+            logger.info("Closed pooled HTTP client")
+        except Exception as e:
+            logger.error(f"Error closing HTTP client: {e}")
+            
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        """Build a client with the configured pool limits and timeouts"""
+        limits = httpx.Limits(
+            max_connections=Config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+        )
+        timeout = httpx.Timeout(Config.HTTP_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT)
+        
+        http2 = Config.HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            http2=http2,
+            headers={'User-Agent': 'VideoGenerator/1.0'}
+        )
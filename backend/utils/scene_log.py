@@ -0,0 +1,100 @@
+import os
+import json
+import logging
+from typing import List, Optional, Tuple
+from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCENES_FILENAME = 'scenes.jsonl'
+
+class SceneLog:
+    """Per-run scenes.jsonl: scenes appended as the script streams, then rewritten from the final script"""
+    
+    @staticmethod
+    def get_path(run_id: str) -> str:
+        """Get the scene log path for a run"""
+        return FileHandler.get_output_path(SCENES_FILENAME, run_id)
+        
+    @staticmethod
+    def reset(run_id: str):
+        """Start the run's scene log empty (a retried task must not append to the failed attempt's)"""
+        try:
+            path = SceneLog.get_path(run_id)
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            logger.error(f"Failed to reset scenes for run {run_id}: {e}")
+            
+    @staticmethod
+    def append(run_id: str, index: int, scene: dict):
+        """Append one scene to the run's scene log; failures never affect the script"""
+        try:
+            # One O_APPEND write per line, like the artifact manifest
+            line = (json.dumps({'sceneIndex': index, **scene}) + '\n').encode('utf-8')
+            fd = os.open(SceneLog.get_path(run_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            logger.error(f"Failed to append scene {index + 1} for run {run_id}: {e}")
+            
+    @staticmethod
+    def write_final(run_id: Optional[str], script: dict, stage: str):
+        """Replace the run's scene log with the final script's scenes and a closing
+        {"done": true, "title", "totalDuration", "scenesCount"} line"""
+        if not run_id:
+            return
+            
+        try:
+            lines = [{'sceneIndex': index, **scene} for index, scene in enumerate(script['scenes'])]
+            lines.append({
+                'done': True,
+                'title': script['title'],
+                'totalDuration': script['totalDuration'],
+                'scenesCount': len(script['scenes'])
+            })
+            content = ''.join(json.dumps(line) + '\n' for line in lines).encode('utf-8')
+            
+            # Write then rename, so a reader sees either the streamed scenes or the final ones
+            path = SceneLog.get_path(run_id)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+            ArtifactManifest.record(run_id, path, stage, content)
+        except Exception as e:
+            logger.error(f"Failed to write scenes for run {run_id}: {e}")
+            
+    @staticmethod
+    def read(run_id: str) -> Tuple[List[dict], Optional[dict]]:
+        """Get the scenes known so far (in order, without gaps) and the closing line once the script is final"""
+        # Read-only lookup: don't create directories for unknown runs
+        path = os.path.join(Config.OUTPUT_DIR, FileHandler._validate_run_id(run_id), SCENES_FILENAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return [], None
+            
+        scenes = {}
+        final = None
+        # The last piece has no newline yet: it is empty or a line still being written
+        for line in content.split('\n')[:-1]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('done'):
+                final = entry
+            elif isinstance(entry.get('sceneIndex'), int):
+                scene = dict(entry)
+                scenes[scene.pop('sceneIndex')] = scene
+                
+        ordered = []
+        while len(ordered) in scenes:
+            ordered.append(scenes[len(ordered)])
+        return ordered, final
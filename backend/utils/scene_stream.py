@@ -0,0 +1,72 @@
+import json
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SceneStreamParser:
+    """Incremental parser that picks each object out of a streamed script's "scenes" array as soon as it closes"""
+    
+    def __init__(self, array_key: str = 'scenes'):
+        self.array_key = array_key
+        self.text = ''
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._in_array = False
+        self._scene_start: Optional[int] = None
+        self._scene_index = 0
+        
+    def feed(self, chunk: str) -> List[Tuple[int, dict]]:
+        """Add streamed text and return the (index, scene) pairs it completed, in order"""
+        scenes = []
+        start = len(self.text)
+        self.text += chunk
+        
+        for i in range(start, len(self.text)):
+            char = self.text[i]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    # Strings directly in the top-level object are its keys (and plain values)
+                    if self._stack == ['{']:
+                        self._last_key = self.text[self._string_start:i]
+                continue
+                
+            if char == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif char in '{[':
+                if char == '[' and self._stack == ['{'] and self._last_key == self.array_key:
+                    self._in_array = True
+                elif char == '{' and self._in_array and len(self._stack) == 2:
+                    self._scene_start = i
+                self._stack.append(char)
+            elif char in '}]' and self._stack:
+                self._stack.pop()
+                if char == '}' and self._in_array and len(self._stack) == 2 and self._scene_start is not None:
+                    scene = self._parse_scene(self.text[self._scene_start:i + 1])
+                    if scene is not None:
+                        scenes.append((self._scene_index, scene))
+                    self._scene_index += 1
+                    self._scene_start = None
+                elif char == ']' and self._in_array and len(self._stack) == 1:
+                    self._in_array = False
+                    
+        return scenes
+        
+    def _parse_scene(self, text: str) -> Optional[dict]:
+        """Decode one scene object; a malformed one is skipped and left to the full parse"""
+        try:
+            scene = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed streamed scene {self._scene_index + 1}: {e}")
+            return None
+        return scene if isinstance(scene, dict) else None
@@ -0,0 +1,66 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Optional
+from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class StageOutput:
+    """Large stage outputs stored once per run, passed between tasks as compact references"""
+    
+    @staticmethod
+    def write(run_id: Optional[str], name: str, data: Any, stage: str, indent: Optional[int] = None) -> Optional[dict]:
+        """Write data as output/{run_id}/{name}.json and return its reference (path, size, sha256)"""
+        if not run_id:
+            return None
+            
+        content = json.dumps(data, indent=indent).encode('utf-8')
+        filepath = FileHandler.get_output_path(f"{name}.json", run_id)
+        
+        # Write then rename, so a reader never sees a partial file
+        temp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, filepath)
+        
+        entry = ArtifactManifest.record(run_id, filepath, stage, content)
+        return {
+            'path': filepath.replace(os.sep, '/'),
+            'size': len(content),
+            'sha256': entry['sha256'] if entry else hashlib.sha256(content).hexdigest()
+        }
+        
+    @staticmethod
+    def read(ref: dict) -> Any:
+        """Load the data a reference points to, verifying its checksum"""
+        with open(ref['path'], 'rb') as f:
+            content = f.read()
+            
+        if ref.get('sha256') and hashlib.sha256(content).hexdigest() != ref['sha256']:
+            raise Exception(f"Stage output {ref['path']} does not match its checksum")
+        return json.loads(content)
+        
+    @staticmethod
+    def output(run_id: Optional[str], key: str, data: Any, stage: str) -> dict:
+        """Task output fields for data: {key + 'Ref': ref} when stored, otherwise {key: data} inline"""
+        if Config.STAGE_OUTPUT_REFS:
+            try:
+                ref = StageOutput.write(run_id, key, data, stage)
+                if ref:
+                    return {f"{key}Ref": ref}
+            except Exception as e:
+                logger.error(f"Failed to store {key} for run {run_id}, passing it inline: {e}")
+        return {key: data}
+        
+    @staticmethod
+    def resolve(input_data: dict, key: str) -> Any:
+        """Get an input passed either inline as `key` or by reference as `key + 'Ref'`"""
+        if input_data.get(key) is not None:
+            return input_data[key]
+            
+        ref = input_data.get(f"{key}Ref")
+        return StageOutput.read(ref) if ref else None
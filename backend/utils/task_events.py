@@ -0,0 +1,107 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class TaskEventChannel:
+    """Shared SQLite table that worker processes append task events to and the API tails"""
+    
+    def __init__(self, path: str = None):
+        self.path = path or Config.TASK_EVENTS_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        
+    def publish(self, workflow_id: Optional[str], task_type: str, status: str,
+                task_id: Optional[str] = None, run_id: Optional[str] = None, error: Optional[str] = None):
+        """Append a task event; failures are logged and never affect the task"""
+        if not Config.TASK_EVENTS_ENABLED or not (workflow_id or run_id):
+            return
+            
+        try:
+            with self._lock:
+                self._connect().execute(
+                    """
+                    INSERT INTO task_events (workflow_id, run_id, task_type, task_id, status, error, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (workflow_id, run_id, task_type, task_id, status, error, time.time())
+                )
+        except Exception as e:
+            logger.error(f"Failed to publish {status} event for task {task_type}: {e}")
+            
+    def read_since(self, last_id: int, limit: int = 500) -> Tuple[List[dict], int]:
+        """Get events after last_id in order, and the id to resume from"""
+        with self._lock:
+            rows = self._connect().execute(
+                """
+                SELECT id, workflow_id, run_id, task_type, task_id, status, error, created_at
+                FROM task_events WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                (last_id, limit)
+            ).fetchall()
+            
+        events = [
+            {
+                'id': row[0],
+                'workflowId': row[1],
+                'runId': row[2],
+                'taskType': row[3],
+                'taskId': row[4],
+                'status': row[5],
+                'error': row[6],
+                'createdAt': row[7]
+            }
+            for row in rows
+        ]
+        return events, (rows[-1][0] if rows else last_id)
+        
+    def get_latest_id(self) -> int:
+        """Get the id of the newest event, so a consumer can skip history"""
+        with self._lock:
+            row = self._connect().execute("SELECT MAX(id) FROM task_events").fetchone()
+        return row[0] or 0
+        
+    def prune(self, max_age_seconds: float = None):
+        """Delete events older than the retention period"""
+        max_age_seconds = max_age_seconds or Config.TASK_EVENTS_RETENTION_SECONDS
+        with self._lock:
+            self._connect().execute("DELETE FROM task_events WHERE created_at < ?", (time.time() - max_age_seconds,))
+            
+    def _connect(self) -> sqlite3.Connection:
+        """Get this process's connection, creating the table on first use"""
+        # Worker processes are forked from the API process and must not share its connection
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    workflow_id TEXT,
+                    run_id TEXT,
+                    task_type TEXT NOT NULL,
+                    task_id TEXT,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_events_created_at ON task_events (created_at)")
+            
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            
+        return self._conn
+
+# Shared channel instance
+task_events = TaskEventChannel()
@@ -0,0 +1,146 @@
+import math
+import time
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MOTIONS = ('zoom_in', 'pan_right', 'zoom_out', 'pan_left', 'static')
+MAX_ZOOM = 1.15
+BLEND_BATCH_SIZE = 8
+
+def get_source_size(width: int, height: int) -> tuple:
+    """Size a still must cover so every Ken Burns viewport downsamples rather than upsamples"""
+    return math.ceil(width * MAX_ZOOM), math.ceil(height * MAX_ZOOM)
+
+def get_scene_motion(scene: dict) -> str:
+    """Pick a motion for a scene: an explicit 'motion' key, otherwise cycle by scene index"""
+    motion = scene.get('motion')
+    if motion in MOTIONS:
+        return motion
+    return MOTIONS[int(scene.get('sceneIndex') or 0) % len(MOTIONS)]
+
+class KenBurns:
+    """Pan/zoom over a still using precomputed per-frame sampling grids"""
+    
+    def __init__(self, source: np.ndarray, width: int, height: int, frame_count: int, motion: str = 'zoom_in'):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.frame_count = max(1, frame_count)
+        self.motion = motion if motion in MOTIONS else 'static'
+        
+        self.ys, self.xs = self._build_grids()
+        
+        # Intermediate row buffer reused by every frame
+        self._rows = np.empty((height, source.shape[1], 3), dtype=np.uint8)
+        
+    def render(self, index: int, out: np.ndarray) -> np.ndarray:
+        """Sample frame `index` into `out` (height, width, 3) without allocating"""
+        # Separable nearest-neighbour sampling: gather rows, then columns
+        np.take(self.source, self.ys[index], axis=0, out=self._rows, mode='clip')
+        np.take(self._rows, self.xs[index], axis=1, out=out, mode='clip')
+        return out
+        
+    def _build_grids(self) -> tuple:
+        """Compute source row/column indices for every frame in one vectorized pass"""
+        source_height, source_width = self.source.shape[:2]
+        
+        # Smoothstep easing over the scene
+        t = np.linspace(0.0, 1.0, self.frame_count, dtype=np.float64)
+        progress = t * t * (3.0 - 2.0 * t)
+        
+        if self.motion == 'zoom_in':
+            zoom = 1.0 + (MAX_ZOOM - 1.0) * progress
+        elif self.motion == 'zoom_out':
+            zoom = MAX_ZOOM - (MAX_ZOOM - 1.0) * progress
+        elif self.motion in ('pan_left', 'pan_right'):
+            zoom = np.full(self.frame_count, MAX_ZOOM)
+        else:
+            zoom = np.ones(self.frame_count)
+            
+        # Viewport size in source pixels; zoom 1 shows the whole source
+        view_width = source_width / zoom
+        view_height = source_height / zoom
+        slack_x = source_width - view_width
+        slack_y = source_height - view_height
+        
+        if self.motion == 'pan_right':
+            left = slack_x * progress
+        elif self.motion == 'pan_left':
+            left = slack_x * (1.0 - progress)
+        else:
+            left = slack_x / 2.0
+        top = slack_y / 2.0
+        
+        # (frames, 1) x (1, pixels) -> per-frame affine maps from output to source pixels
+        column_centers = (np.arange(self.width, dtype=np.float64) + 0.5)[None, :]
+        row_centers = (np.arange(self.height, dtype=np.float64) + 0.5)[None, :]
+        xs = np.asarray(left)[..., None] + column_centers * (view_width / self.width)[:, None]
+        ys = np.asarray(top)[..., None] + row_centers * (view_height / self.height)[:, None]
+        
+        xs = np.clip(xs, 0, source_width - 1).astype(np.intp)
+        ys = np.clip(ys, 0, source_height - 1).astype(np.intp)
+        return ys, xs
+
+class Crossfade:
+    """Batched fixed-point blends from an outgoing frame into incoming frames"""
+    
+    def __init__(self, width: int, height: int, frame_count: int, batch_size: int = BLEND_BATCH_SIZE):
+        self.frame_count = max(1, frame_count)
+        self.batch_size = max(1, min(batch_size, self.frame_count))
+        
+        # Incoming weight per frame out of 256, excluding the fully-out and fully-in endpoints
+        weights = (np.arange(1, self.frame_count + 1) * 256) // (self.frame_count + 1)
+        self.incoming_weights = weights.astype(np.uint16).reshape(-1, 1, 1, 1)
+        self.outgoing_weights = (256 - weights).astype(np.uint16).reshape(-1, 1, 1, 1)
+        
+        shape = (self.batch_size, height, width, 3)
+        self.frames = np.empty(shape, dtype=np.uint8)
+        self._accumulator = np.empty(shape, dtype=np.uint16)
+        self._scratch = np.empty(shape, dtype=np.uint16)
+        
+    def blend(self, outgoing: np.ndarray, start: int, count: int) -> np.ndarray:
+        """Blend `outgoing` into self.frames[:count], which hold incoming frames start..start+count"""
+        incoming = self.frames[:count]
+        accumulator = self._accumulator[:count]
+        scratch = self._scratch[:count]
+        
+        # (incoming * w_in + outgoing * w_out) >> 8 never exceeds 255 * 256
+        np.multiply(incoming, self.incoming_weights[start:start + count], out=accumulator)
+        np.multiply(outgoing, self.outgoing_weights[start:start + count], out=scratch)
+        np.add(accumulator, scratch, out=accumulator)
+        np.right_shift(accumulator, 8, out=accumulator)
+        np.copyto(incoming, accumulator, casting='unsafe')
+        return incoming
+
+def run_benchmark(width: int = 1024, height: int = 576, frames: int = 120) -> dict:
+    """Measure frames per second for each motion and for crossfades"""
+    rng = np.random.default_rng(0)
+    source_width, source_height = get_source_size(width, height)
+    source = rng.integers(0, 256, (source_height, source_width, 3), dtype=np.uint8)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    results = {}
+    
+    for motion in MOTIONS:
+        ken_burns = KenBurns(source, width, height, frames, motion)
+        started = time.perf_counter()
+        for index in range(frames):
+            ken_burns.render(index, frame)
+        results[motion] = frames / (time.perf_counter() - started)
+        
+    outgoing = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    crossfade = Crossfade(width, height, frames)
+    crossfade.frames[:] = rng.integers(0, 256, crossfade.frames.shape, dtype=np.uint8)
+    started = time.perf_counter()
+    for start in range(0, frames, crossfade.batch_size):
+        crossfade.blend(outgoing, start, min(crossfade.batch_size, frames - start))
+    results['crossfade'] = frames / (time.perf_counter() - started)
+    
+    return results
+
+if __name__ == "__main__":
+    width, height = 1024, 576
+    print(f"Transition benchmark at {width}x{height}")
+    for name, fps in run_benchmark(width, height).items():
+        print(f"  {name:<10} {fps:8.1f} fps")
@@ -0,0 +1,334 @@
+import os
+import shutil
+import logging
+import functools
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from PIL import Image
+from utils.video_effects import KenBurns, Crossfade, get_scene_motion, get_source_size
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.aac', '.ogg')
+AUDIO_SAMPLE_RATE = 44100
+VIDEO_TIMESCALE = 90000
+BACKGROUND_COLOR = (16, 16, 16)
+QUALITIES = ('draft', 'final')
+
+class VideoRenderer:
+    """Render a scene list to MP4, encoding scenes as parallel segments joined without re-encoding"""
+    
+    def __init__(self, width: int = None, height: int = None, fps: int = None,
+                 preset: str = None, crf: int = None, workers: int = None,
+                 motion: bool = None, transition_seconds: float = None):
+        self.width = width or Config.VIDEO_WIDTH
+        self.height = height or Config.VIDEO_HEIGHT
+        self.fps = fps or Config.VIDEO_FPS
+        self.preset = preset or Config.VIDEO_PRESET
+        self.crf = crf if crf is not None else Config.VIDEO_CRF
+        self.workers = max(1, workers or Config.RENDER_WORKERS)
+        self.motion = Config.VIDEO_MOTION_ENABLED if motion is None else motion
+        self.transition_seconds = Config.VIDEO_TRANSITION_SECONDS if transition_seconds is None else transition_seconds
+        
+    @classmethod
+    def for_quality(cls, quality: str = 'final') -> 'VideoRenderer':
+        """Create a renderer for a quality mode: 'draft' previews or 'final' full renders"""
+        if quality not in QUALITIES:
+            raise Exception(f"Unknown video quality '{quality}', expected one of {', '.join(QUALITIES)}")
+            
+        if quality == 'draft':
+            return cls(
+                width=Config.DRAFT_VIDEO_WIDTH,
+                height=Config.DRAFT_VIDEO_HEIGHT,
+                fps=Config.DRAFT_VIDEO_FPS,
+                preset=Config.DRAFT_VIDEO_PRESET,
+                crf=Config.DRAFT_VIDEO_CRF
+            )
+        return cls()
+        
+    def get_settings(self) -> dict:
+        """Return the encoder settings shared by every segment of a render"""
+        return {
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'preset': self.preset,
+            'crf': self.crf,
+            'workers': self.workers,
+            'motion': self.motion,
+            'transition_seconds': self.transition_seconds
+        }
+        
+    def render(self, scenes: List[dict], output_path: str) -> dict:
+        """Render scenes (as built in video_data['scenes']) to an MP4 file"""
+        if not scenes:
+            raise Exception('At least one scene is required to render a video')
+            
+        frame_counts = self.get_frame_counts(scenes)
+        workers = min(self.workers, len(scenes))
+        
+        logger.info(f"Rendering {len(scenes)} scenes ({sum(frame_counts)} frames) to {output_path} with {workers} workers")
+        
+        segment_dir = tempfile.mkdtemp(prefix='segments_', dir=os.path.dirname(output_path) or '.')
+        try:
+            jobs = [
+                self.build_segment_job(index, scene, frame_counts, segment_dir, scenes[index - 1] if index > 0 else None)
+                for index, scene in enumerate(scenes)
+            ]
+            
+            if workers == 1:
+                segment_paths = [render_segment(job) for job in jobs]
+            else:
+                with self.create_executor(workers) as executor:
+                    # map preserves job order, so segments come back in scene order
+                    segment_paths = list(executor.map(render_segment, jobs))
+                    
+            self.concat_segments(segment_paths, output_path)
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+        
+        logger.info(f"Video rendered: {output_path}")
+        return {
+            'videoPath': output_path,
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'frames': sum(frame_counts),
+            'duration': round(sum(frame_counts) / self.fps, 3)
+        }
+        
+    def render_scene(self, scene: dict, frame_count: int, output_path: str, previous: Optional[dict] = None) -> str:
+        """Encode one scene to a self-contained segment by streaming raw frames into ffmpeg"""
+        command = self._build_segment_command(scene, frame_count, output_path)
+        
+        # ffmpeg's log goes to a temp file so a full stderr pipe can never stall the render
+        with tempfile.TemporaryFile() as stderr_log:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=stderr_log)
+            
+            try:
+                self._write_scene_frames(process.stdin, scene, frame_count, previous)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            except Exception:
+                process.kill()
+                process.wait()
+                raise
+                
+            self._check_ffmpeg(process.wait(), stderr_log)
+            
+        return output_path
+        
+    def concat_segments(self, segment_paths: List[str], output_path: str):
+        """Join segments with the concat demuxer using stream copy (no re-encode)"""
+        list_path = f"{output_path}.segments.txt"
+        with open(list_path, 'w') as f:
+            for segment_path in segment_paths:
+                escaped_path = os.path.abspath(segment_path).replace("'", "'\\''")
+                f.write(f"file '{escaped_path}'\n")
+                
+        command = [
+            Config.FFMPEG_BINARY, '-y', '-loglevel', 'error',
+            '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-c', 'copy', '-movflags', '+faststart',
+            output_path
+        ]
+        
+        try:
+            with tempfile.TemporaryFile() as stderr_log:
+                self._check_ffmpeg(subprocess.run(command, stderr=stderr_log).returncode, stderr_log)
+        finally:
+            os.remove(list_path)
+        
+    def _write_scene_frames(self, stream, scene: dict, frame_count: int, previous: Optional[dict] = None):
+        """Stream a scene's frames, crossfading in from the previous scene's last frame"""
+        if not self.motion:
+            # Only the scene's still is held in memory
+            frame = self._load_frame(scene.get('imagePath'), self.width, self.height)
+            for _ in range(frame_count):
+                stream.write(frame)
+            return
+            
+        ken_burns = self._create_ken_burns(scene, frame_count)
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        
+        # The transition occupies the start of this scene, so scene timing is unchanged
+        transition_frames = min(frame_count, round(self.transition_seconds * self.fps)) if previous else 0
+        if transition_frames > 0:
+            previous_ken_burns = self._create_ken_burns(previous['scene'], previous['frameCount'])
+            outgoing = previous_ken_burns.render(previous_ken_burns.frame_count - 1, frame).copy()
+            crossfade = Crossfade(self.width, self.height, transition_frames)
+            
+            for start in range(0, transition_frames, crossfade.batch_size):
+                count = min(crossfade.batch_size, transition_frames - start)
+                for offset in range(count):
+                    ken_burns.render(start + offset, crossfade.frames[offset])
+                stream.write(crossfade.blend(outgoing, start, count))
+                
+        if ken_burns.motion == 'static':
+            ken_burns.render(0, frame)
+            for _ in range(transition_frames, frame_count):
+                stream.write(frame)
+            return
+            
+        # Frames are sampled into one reused buffer
+        for index in range(transition_frames, frame_count):
+            stream.write(ken_burns.render(index, frame))
+            
+    def _create_ken_burns(self, scene: dict, frame_count: int) -> KenBurns:
+        """Load a scene's still at Ken Burns source size and precompute its sampling grids"""
+        source_width, source_height = get_source_size(self.width, self.height)
+        source = self._load_frame(scene.get('imagePath'), source_width, source_height)
+        return KenBurns(source, self.width, self.height, frame_count, get_scene_motion(scene))
+        
+    def build_segment_job(self, index: int, scene: dict, frame_counts: List[int], segment_dir: str,
+                          previous_scene: Optional[dict] = None) -> dict:
+        """Describe the render of one scene's segment, for render_segment in any process"""
+        return {
+            'scene': scene,
+            'frameCount': frame_counts[index],
+            'segmentPath': os.path.join(segment_dir, f"segment_{index + 1:04d}.mp4"),
+            'previous': {'scene': previous_scene, 'frameCount': frame_counts[index - 1]} if previous_scene else None,
+            'settings': self.get_settings()
+        }
+        
+    def get_frame_counts(self, scenes: List[dict]) -> List[int]:
+        """Convert scene lengths to frame counts without accumulating rounding drift"""
+        frame_counts = []
+        elapsed = 0.0
+        rendered_frames = 0
+        
+        for scene in scenes:
+            elapsed += self.get_scene_seconds(scene)
+            end_frame = max(rendered_frames + 1, round(elapsed * self.fps))
+            frame_counts.append(end_frame - rendered_frames)
+            rendered_frames = end_frame
+            
+        return frame_counts
+        
+    def get_scene_seconds(self, scene: dict) -> float:
+        """A scene's length: its scripted duration, stretched so its narration is never cut off"""
+        seconds = max(0.0, float(scene.get('duration') or 0))
+        audio_path = scene.get('audioPath')
+        if self._has_audio(audio_path):
+            audio_seconds = get_audio_seconds(audio_path)
+            if audio_seconds:
+                # One frame of slack, since segment boundaries are rounded to whole frames
+                seconds = max(seconds, audio_seconds + 1 / self.fps)
+        return seconds
+        
+    def _build_segment_command(self, scene: dict, frame_count: int, output_path: str) -> list:
+        """Build the ffmpeg command for one segment: raw frames on stdin plus the scene audio"""
+        duration = frame_count / self.fps
+        command = [
+            Config.FFMPEG_BINARY, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f"{self.width}x{self.height}", '-r', str(self.fps),
+            '-i', 'pipe:0'
+        ]
+        
+        audio_path = scene.get('audioPath')
+        if self._has_audio(audio_path):
+            command += ['-i', audio_path]
+        else:
+            command += ['-f', 'lavfi', '-i', f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo"]
+            
+        # Audio is padded to exactly the segment's frame span, which is never shorter than the narration
+        audio_filter = (
+            f"[1:a]aformat=sample_rates={AUDIO_SAMPLE_RATE}:channel_layouts=stereo,"
+            f"apad,atrim=0:{duration:.6f},asetpts=PTS-STARTPTS[aout]"
+        )
+        
+        # Every segment must share codec parameters for the stream-copy concat
+        command += [
+            '-filter_complex', audio_filter,
+            '-map', '0:v', '-map', '[aout]',
+            '-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p', '-threads', str(self._get_encoder_threads()),
+            '-video_track_timescale', str(VIDEO_TIMESCALE),
+            '-c:a', 'aac', '-b:a', '128k', '-ar', str(AUDIO_SAMPLE_RATE), '-ac', '2',
+            output_path
+        ]
+        return command
+        
+    def _get_encoder_threads(self) -> int:
+        """Split the machine's cores between the segments encoding at once"""
+        return max(1, (os.cpu_count() or 1) // self.workers)
+        
+    def _load_frame(self, image_path: Optional[str], width: int, height: int) -> np.ndarray:
+        """Load a scene image scaled to cover width x height, or a blank frame if unavailable"""
+        if image_path and os.path.exists(image_path):
+            try:
+                with Image.open(image_path) as image:
+                    image = image.convert('RGB')
+                    
+                    # Scale to cover the target size, then center-crop the overflow
+                    scale = max(width / image.width, height / image.height)
+                    resized = image.resize(
+                        (max(width, round(image.width * scale)), max(height, round(image.height * scale))),
+                        Image.LANCZOS
+                    )
+                    left = (resized.width - width) // 2
+                    top = (resized.height - height) // 2
+                    cropped = resized.crop((left, top, left + width, top + height))
+                    return np.ascontiguousarray(np.asarray(cropped, dtype=np.uint8))
+            except Exception as e:
+                logger.error(f"Failed to load scene image {image_path}: {e}")
+                
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[:] = BACKGROUND_COLOR
+        return frame
+        
+    @staticmethod
+    def create_executor(workers: int) -> Executor:
+        """Use a process pool, or threads where this process is not allowed children"""
+        # Conductor runs workers in daemonic processes, which cannot spawn a pool;
+        # threads still parallelize well since the encoding happens inside ffmpeg
+        if multiprocessing.current_process().daemon:
+            return ThreadPoolExecutor(max_workers=workers)
+        return ProcessPoolExecutor(max_workers=workers)
+        
+    @staticmethod
+    def _check_ffmpeg(return_code: int, stderr_log):
+        """Raise with ffmpeg's error output if it exited unsuccessfully"""
+        if return_code != 0:
+            stderr_log.seek(0)
+            error_output = stderr_log.read().decode('utf-8', errors='replace').strip()
+            raise Exception(f"ffmpeg exited with code {return_code}: {error_output[-500:]}")
+        
+    @staticmethod
+    def _has_audio(audio_path: Optional[str]) -> bool:
+        """Check the path points at a real audio file (TTS placeholders are text files)"""
+        return bool(audio_path) and audio_path.lower().endswith(AUDIO_EXTENSIONS) and os.path.exists(audio_path)
+
+def get_audio_seconds(audio_path: str) -> Optional[float]:
+    """Length of an audio file in seconds as measured by ffprobe; None if it can't be read"""
+    try:
+        stat = os.stat(audio_path)
+    except OSError:
+        return None
+    return _probe_audio_seconds(audio_path, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=1024)
+def _probe_audio_seconds(audio_path: str, mtime_ns: int, size: int) -> Optional[float]:
+    """Run ffprobe once per version of a file (the modification time and size are part of the cache key)"""
+    try:
+        result = subprocess.run(
+            [Config.FFPROBE_BINARY, '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', audio_path],
+            capture_output=True, text=True, timeout=30
+        )
+        return float(result.stdout.strip()) if result.returncode == 0 else None
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Could not measure audio length of {audio_path}: {e}")
+        return None
+
+def render_segment(job: dict) -> str:
+    """Render one scene segment; module-level so it can run in a worker process"""
+    settings = job['settings']
+    renderer = VideoRenderer(**settings)
+    return renderer.render_scene(job['scene'], job['frameCount'], job['segmentPath'], job.get('previous'))
@@ -2,5 +2,12 @@ from .script_worker import ScriptWorker
 from .image_worker import ImageWorker
 from .audio_worker import AudioWorker
 from .video_worker import VideoWorker
+from .scene_plan_worker import ScenePlanWorker
+from .scene_image_worker import SceneImageWorker
+from .scene_audio_worker import SceneAudioWorker
+from .scene_pipeline_worker import ScenePipelineWorker
 
-__all__ = ['ScriptWorker', 'ImageWorker', 'AudioWorker', 'VideoWorker']
\ No newline at end of file
+__all__ = [
+    'ScriptWorker', 'ImageWorker', 'AudioWorker', 'VideoWorker',
+    'ScenePlanWorker', 'SceneImageWorker', 'SceneAudioWorker', 'ScenePipelineWorker'
+]
\ No newline at end of file
@@ -2,19 +2,30 @@ import asyncio
 import httpx
 import json
 import logging
+import re
+from typing import List, Optional, Tuple
 from urllib.parse import quote
 from workers.base_worker import BaseWorker
 from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from utils.stage_output import StageOutput
+from utils.http_client import HttpClient
+from utils.content_cache import ContentCache
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+TTS_LANGUAGE = 'en'
+
 class AudioWorker(BaseWorker):
-    def __init__(self):
-        super().__init__("generate_audio", poll_interval=1.0)
+    def __init__(self, task_def_name: str = "generate_audio"):
+        super().__init__(task_def_name, poll_interval=1.0)
+        self.cache = ContentCache(Config.TTS_CACHE_DIR, Config.TTS_CACHE_MAX_BYTES, '.mp3') if Config.TTS_CACHE_ENABLED else None
         
-    def process_task(self, input_data: dict, task_id: str) -> dict:
+    async def process_task(self, input_data: dict, task_id: str) -> dict:
         """Generate audio for script scenes using TTS services"""
-        script = input_data.get('script')
+        script = StageOutput.resolve(input_data, 'script')
+        run_id = input_data.get('run_id')
         
         if not script or not script.get('scenes'):
             raise Exception('Script with scenes is required for audio generation')
@@ -22,17 +33,12 @@ class AudioWorker(BaseWorker):
         logger.info(f"Generating audio for {len(script['scenes'])} scenes")
         logger.info(f"Script title: '{script['title']}'")
         
-        # Use asyncio to run async audio generation
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            audio_files = loop.run_until_complete(self._generate_audio_for_script(script))
-        finally:
-            loop.close()
+        audio_files = await self._generate_audio_for_script(script, run_id)
         
         successful_audio = [audio for audio in audio_files if audio.get('filepath') and not audio.get('error')]
         failed_audio = [audio for audio in audio_files if audio.get('error')]
         placeholder_audio = [audio for audio in audio_files if audio.get('isPlaceholder')]
+        cached_audio = [audio for audio in audio_files if audio.get('cached')]
         
         logger.info(f"Audio generation completed:")
         logger.info(f"  Successful: {len(successful_audio)}/{len(script['scenes'])}")
@@ -40,60 +46,71 @@ class AudioWorker(BaseWorker):
             logger.info(f"  Placeholders: {len(placeholder_audio)}")
         if failed_audio:
             logger.info(f"  Failed: {len(failed_audio)}")
+        if self.cache:
+            logger.info(f"  From cache: {len(cached_audio)} (process totals: {self.cache.stats()})")
         
+        # The script is already stored for the run; only the new list goes out
         return {
-            'audioFiles': audio_files,
-            'script': script,
+            **StageOutput.output(run_id, 'audioFiles', audio_files, self.task_def_name),
             'statistics': {
                 'totalScenes': len(script['scenes']),
                 'successfulAudio': len(successful_audio),
                 'placeholderAudio': len(placeholder_audio),
                 'failedAudio': len(failed_audio),
+                'cachedAudio': len(cached_audio),
                 'successRate': round((len(successful_audio) / len(script['scenes'])) * 100)
             },
             'message': f"Generated audio for {len(successful_audio)}/{len(script['scenes'])} scenes ({len(placeholder_audio)} placeholders)"
         }
         
-    async def _generate_audio_for_script(self, script: dict) -> list:
-        """Generate audio for all scenes in the script"""
-        audio_files = []
+    async def _generate_audio_for_script(self, script: dict, run_id: str = None) -> list:
+        """Generate audio for all scenes in the script, a bounded number of requests at a time"""
         FileHandler.ensure_directories()
         
-        for i, scene in enumerate(script['scenes']):
-            filename = f"audio_scene_{i + 1}.mp3"
-            
-            try:
-                audio_result = await self._generate_speech(scene['text'], filename)
-                
-                audio_files.append({
-                    'sceneIndex': i,
-                    'filename': audio_result['filename'],
-                    'filepath': audio_result['filepath'],
-                    'text': scene['text'],
-                    'duration': audio_result['duration'],
-                    'isPlaceholder': audio_result.get('isPlaceholder', False),
-                    'isRealAudio': audio_result.get('isRealAudio', False)
-                })
-                
-                # Small delay between requests
-                await asyncio.sleep(0.5)
-                
-            except Exception as audio_error:
-                logger.error(f"Failed to generate audio for scene {i + 1}: {audio_error}")
-                
-                audio_files.append({
-                    'sceneIndex': i,
-                    'filename': f"placeholder_audio_{i + 1}.mp3",
-                    'filepath': None,
-                    'text': scene['text'],
-                    'duration': self._estimate_audio_duration(scene['text']),
-                    'error': str(audio_error)
-                })
+        # One semaphore bounds TTS requests across all scenes and their chunks
+        semaphore = asyncio.Semaphore(max(1, Config.AUDIO_CONCURRENCY))
+        
+        # gather preserves argument order, so results stay in scene order
+        audio_files = await asyncio.gather(*(
+            self._generate_scene_audio(i, scene, semaphore, run_id) for i, scene in enumerate(script['scenes'])
+        ))
         
         logger.info(f"Generated audio for {len([audio for audio in audio_files if audio.get('filepath')])}/{len(script['scenes'])} scenes")
-        return audio_files
+        return list(audio_files)
         
-    async def _generate_speech(self, text: str, filename: str, voice: str = 'nova') -> dict:
+    async def _generate_scene_audio(self, i: int, scene: dict, semaphore: Optional[asyncio.Semaphore] = None,
+                                    run_id: str = None) -> dict:
+        """Generate the narration for a single scene, returning a placeholder entry on failure"""
+        filename = f"audio_scene_{i + 1}.mp3"
+        
+        try:
+            audio_result = await self._generate_speech(scene['text'], filename, semaphore=semaphore, run_id=run_id)
+            
+            return {
+                'sceneIndex': i,
+                'filename': audio_result['filename'],
+                'filepath': audio_result['filepath'],
+                'text': scene['text'],
+                'duration': audio_result['duration'],
+                'isPlaceholder': audio_result.get('isPlaceholder', False),
+                'isRealAudio': audio_result.get('isRealAudio', False),
+                'cached': audio_result.get('cached', False)
+            }
+            
+        except Exception as audio_error:
+            logger.error(f"Failed to generate audio for scene {i + 1}: {audio_error}")
+            
+            return {
+                'sceneIndex': i,
+                'filename': f"placeholder_audio_{i + 1}.mp3",
+                'filepath': None,
+                'text': scene['text'],
+                'duration': self._estimate_audio_duration(scene['text']),
+                'error': str(audio_error)
+            }
+        
+    async def _generate_speech(self, text: str, filename: str, voice: str = 'nova',
+                               semaphore: Optional[asyncio.Semaphore] = None, run_id: str = None) -> dict:
         """Generate speech from text using Google Translate TTS"""
         try:
             logger.info(f"Generating speech for: {text[:50]}...")
@@ -101,51 +118,28 @@ class AudioWorker(BaseWorker):
             # Clean the text for audio generation
             clean_text = ''.join(c for c in text if c.isalnum() or c in ' -,.!?').strip()
             
-            # Limit text length to avoid API issues
-            audio_text = clean_text
-            if len(audio_text) > 200:
-                audio_text = audio_text[:200].strip()
-            
-            # Use Google Translate TTS (free and reliable)
-            encoded_text = quote(audio_text)
-            audio_url = f"https://translate.google.com/translate_tts?ie=UTF-8&q={encoded_text}&tl=en&client=tw-ob"
-            
-            logger.info(f"Audio URL: {audio_url[:100]}...")
+            # The TTS endpoint rejects long inputs, so split instead of truncating
+            chunks = self._split_text(clean_text, Config.TTS_MAX_CHARS)
+            if len(chunks) > 1:
+                logger.info(f"Splitting narration into {len(chunks)} chunks")
+            elif not chunks:
+                # Nothing speakable is left after cleaning; an empty MP3 would break the render
+                logger.info("No speakable text in scene, using fallback...")
+                return await self._generate_speech_fallback(text, filename, run_id)
             
-            # Retry logic for network/API issues
-            max_retries = 3
-            
-            for attempt in range(1, max_retries + 1):
-                try:
-                    logger.info(f"Audio attempt {attempt}/{max_retries}")
-                    
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.get(audio_url, headers={
-                            'User-Agent': 'VideoGenerator/1.0'
-                        })
-                    
-                    if response.status_code == 200:
-                        logger.info(f"Audio success on attempt {attempt}")
-                        logger.info(f"Response: {response.status_code} | Size: {len(response.content)} bytes")
-                        break
-                    else:
-                        raise Exception(f"HTTP {response.status_code}")
-                        
-                except Exception as retry_error:
-                    logger.info(f"Audio attempt {attempt} failed: {retry_error}")
-                    
-                    if attempt == max_retries:
-                        logger.info("All audio attempts failed, using fallback...")
-                        return await self._generate_speech_fallback(text, filename)
-                    
-                    # Wait before retry
-                    delay = attempt
-                    logger.info(f"Waiting {delay}s before audio retry...")
-                    await asyncio.sleep(delay)
+            try:
+                results = await asyncio.gather(*(
+                    self._get_speech_chunk(chunk, voice, semaphore) for chunk in chunks
+                ))
+            except Exception as fetch_error:
+                logger.info(f"All audio attempts failed ({fetch_error}), using fallback...")
+                return await self._generate_speech_fallback(text, filename, run_id)
             
-            # Save audio file
-            filepath = FileHandler.get_temp_path(filename)
-            await FileHandler.save_binary(response.content, filepath)
+            # MP3 is a sequence of self-contained frames, so the segments can be joined byte-wise
+            audio_data = b''.join(segment for segment, _ in results)
+            filepath = FileHandler.get_temp_path(filename, run_id)
+            await FileHandler.save_binary(audio_data, filepath)
+            ArtifactManifest.record(run_id, filepath, self.task_def_name, audio_data)
             
             logger.info(f"Real audio generated: {filename}")
             return {
@@ -153,21 +147,117 @@ class AudioWorker(BaseWorker):
                 'filename': filename,
                 'text': clean_text,
                 'duration': self._estimate_audio_duration(clean_text),
-                'isRealAudio': True
+                'isRealAudio': True,
+                'cached': all(cached for _, cached in results)
             }
             
         except Exception as e:
             logger.error(f"TTS error for '{text}': {e}")
             raise Exception(f"TTS API error: {e}")
             
-    async def _generate_speech_fallback(self, text: str, filename: str) -> dict:
+    async def _get_speech_chunk(self, audio_text: str, voice: str,
+                                semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[bytes, bool]:
+        """Get MP3 audio for one chunk from the cache, fetching and caching it on a miss"""
+        if not self.cache:
+            return await self._fetch_speech_chunk(audio_text, semaphore), False
+            
+        # Chunks are whitespace-normalized by _split_text, so repeated sentences share a key
+        cache_key = ContentCache.make_key(
+            provider='google_translate',
+            text=audio_text,
+            voice=voice,
+            language=TTS_LANGUAGE
+        )
+        cached = self.cache.read(cache_key)
+        if cached is not None:
+            return cached, True
+            
+        audio_data = await self._fetch_speech_chunk(audio_text, semaphore)
+        self.cache.put(cache_key, audio_data)
+        return audio_data, False
+        
+    async def _fetch_speech_chunk(self, audio_text: str, semaphore: Optional[asyncio.Semaphore] = None) -> bytes:
+        """Fetch MP3 audio for one chunk of text, retrying on network/API issues"""
+        # Use Google Translate TTS (free and reliable)
+        encoded_text = quote(audio_text)
+        audio_url = f"https://translate.google.com/translate_tts?ie=UTF-8&q={encoded_text}&tl={TTS_LANGUAGE}&client=tw-ob"
+        
+        logger.info(f"Audio URL: {audio_url[:100]}...")
+        
+        max_retries = 3
+        
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.info(f"Audio attempt {attempt}/{max_retries}")
+                
+                if semaphore is not None:
+                    async with semaphore:
+                        response = await self._request_speech(audio_url)
+                else:
+                    response = await self._request_speech(audio_url)
+                
+                if response.status_code == 200:
+                    logger.info(f"Audio success on attempt {attempt}")
+                    logger.info(f"Response: {response.status_code} | Size: {len(response.content)} bytes")
+                    return response.content
+                else:
+                    raise Exception(f"HTTP {response.status_code}")
+                    
+            except Exception as retry_error:
+                logger.info(f"Audio attempt {attempt} failed: {retry_error}")
+                
+                if attempt == max_retries:
+                    raise
+                
+                # Wait before retry (outside the semaphore so other chunks can proceed)
+                delay = attempt
+                logger.info(f"Waiting {delay}s before audio retry...")
+                await asyncio.sleep(delay)
+                
+    async def _request_speech(self, audio_url: str) -> httpx.Response:
+        """Issue a single TTS request on the shared connection pool"""
+        client = HttpClient.get_client()
+        return await client.get(audio_url)
+            
+    @staticmethod
+    def _split_text(text: str, max_chars: int) -> List[str]:
+        """Split text into chunks of at most max_chars, preferring sentence then word boundaries"""
+        text = ' '.join(text.split())
+        if len(text) <= max_chars:
+            return [text] if text else []
+        
+        # Break overlong sentences down to words, and overlong words down to hard slices
+        pieces = []
+        for sentence in re.split(r'(?<=[.!?])\s+', text):
+            if len(sentence) <= max_chars:
+                pieces.append(sentence)
+                continue
+            for word in sentence.split(' '):
+                pieces.extend(word[start:start + max_chars] for start in range(0, len(word), max_chars))
+        
+        # Greedily pack pieces back together up to the limit
+        chunks = []
+        current = ''
+        for piece in pieces:
+            candidate = f"{current} {piece}" if current else piece
+            if len(candidate) <= max_chars:
+                current = candidate
+            else:
+                chunks.append(current)
+                current = piece
+        if current:
+            chunks.append(current)
+        
+        return chunks
+            
+    async def _generate_speech_fallback(self, text: str, filename: str, run_id: str = None) -> dict:
         """Fallback method - creates a text file when TTS fails"""
         try:
             logger.info("Using fallback audio method (TTS API failed)...")
             
             # Create a text file as placeholder
             audio_filename = filename.replace('.mp3', '_placeholder.txt')
-            filepath = FileHandler.get_temp_path(audio_filename)
+            filepath = FileHandler.get_temp_path(audio_filename, run_id)
             
             tts_data = {
                 'text': text,
@@ -178,6 +268,7 @@ class AudioWorker(BaseWorker):
             }
             
             await FileHandler.save_text(json.dumps(tts_data, indent=2), filepath)
+            ArtifactManifest.record(run_id, filepath, self.task_def_name)
             
             logger.info(f"Created audio placeholder: {audio_filename}")
             return {
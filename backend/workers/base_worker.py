@@ -1,11 +1,27 @@
+import asyncio
+import atexit
+import inspect
 import logging
+import multiprocessing
+import os
+import signal
+import threading
 from abc import ABC, abstractmethod
+from typing import Optional
 from conductor.client.worker.worker_interface import WorkerInterface
 from conductor.client.worker.worker_task import WorkerTask
+from utils.http_client import HttpClient
+from utils.task_events import task_events
 
 logger = logging.getLogger(__name__)
 
 class BaseWorker(WorkerInterface, ABC):
+    # One long-lived event loop per worker process, shared by all async workers
+    _event_loop: Optional[asyncio.AbstractEventLoop] = None
+    _event_loop_thread: Optional[threading.Thread] = None
+    _event_loop_pid: Optional[int] = None
+    _event_loop_lock = threading.Lock()
+    
     def __init__(self, task_def_name: str, poll_interval: float = 1.0):
         super().__init__(task_definition_name=task_def_name)
         self.task_def_name = task_def_name
@@ -29,29 +45,118 @@ class BaseWorker(WorkerInterface, ABC):
         
     def execute(self, task: WorkerTask) -> WorkerTask:
         """Execute the task - calls the abstract process_task method"""
+        # Extract input data
+        input_data = task.input_data if task.input_data else {}
+        workflow_id = getattr(task, 'workflow_instance_id', None)
+        run_id = input_data.get('run_id')
+        
         try:
             logger.info(f"Processing task: {self.task_def_name}, task_id: {task.task_id}")
             
-            # Extract input data
-            input_data = task.input_data if task.input_data else {}
+            # Let the API see the task start without polling Conductor
+            task_events.publish(workflow_id, self.task_def_name, "IN_PROGRESS", task.task_id, run_id)
             
-            # Process the task
-            result = self.process_task(input_data, task.task_id)
+            # Process the task (async workers run on the shared process loop)
+            if inspect.iscoroutinefunction(self.process_task):
+                result = self.run_async(self.process_task(input_data, task.task_id))
+            else:
+                result = self.process_task(input_data, task.task_id)
             
             # Set the result
             task.output_data = result
             task.status = "COMPLETED"
             
             logger.info(f"Task {self.task_def_name} completed successfully")
+            task_events.publish(workflow_id, self.task_def_name, "COMPLETED", task.task_id, run_id)
             
         except Exception as e:
             logger.error(f"Task {self.task_def_name} failed: {str(e)}")
             task.output_data = {"error": str(e)}
             task.status = "FAILED"
+            task_events.publish(workflow_id, self.task_def_name, "FAILED", task.task_id, run_id, str(e))
             
         return task
         
+    def run_async(self, coro):
+        """Run a coroutine to completion on the worker process event loop"""
+        loop = BaseWorker.get_event_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        
+    @classmethod
+    def get_event_loop(cls) -> asyncio.AbstractEventLoop:
+        """Return the process-wide worker loop, starting it on first use"""
+        with BaseWorker._event_loop_lock:
+            # Worker processes are forked from the parent, which may already own a loop
+            if BaseWorker._event_loop is None or BaseWorker._event_loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=BaseWorker._run_event_loop,
+                    args=(loop,),
+                    name="worker-event-loop",
+                    daemon=True
+                )
+                thread.start()
+                
+                BaseWorker._event_loop = loop
+                BaseWorker._event_loop_thread = thread
+                BaseWorker._event_loop_pid = os.getpid()
+                BaseWorker._install_sigterm_handler()
+                logger.info(f"Started worker event loop for process {os.getpid()}")
+                
+            return BaseWorker._event_loop
+            
+    @classmethod
+    def shutdown_event_loop(cls):
+        """Close pooled connections and stop the worker process loop"""
+        with BaseWorker._event_loop_lock:
+            loop = BaseWorker._event_loop
+            thread = BaseWorker._event_loop_thread
+            if loop is None or BaseWorker._event_loop_pid != os.getpid():
+                return
+                
+            BaseWorker._event_loop = None
+            BaseWorker._event_loop_thread = None
+            BaseWorker._event_loop_pid = None
+            
+        try:
+            asyncio.run_coroutine_threadsafe(HttpClient.close(), loop).result(timeout=5)
+        except Exception as e:
+            logger.error(f"Error closing HTTP client on worker loop: {e}")
+            
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        logger.info(f"Stopped worker event loop for process {os.getpid()}")
+        
+    @staticmethod
+    def _install_sigterm_handler():
+        """Close pooled connections when a worker child process is terminated, where atexit never runs"""
+        # The API process shuts the loop down itself, and only a main thread may set signal handlers
+        if multiprocessing.parent_process() is None or threading.current_thread() is not threading.main_thread():
+            return
+            
+        previous = signal.getsignal(signal.SIGTERM)
+        
+        def handle_sigterm(signum, frame):
+            BaseWorker.shutdown_event_loop()
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                # Terminate as the signal would have
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+                
+        signal.signal(signal.SIGTERM, handle_sigterm)
+        
+    @staticmethod
+    def _run_event_loop(loop: asyncio.AbstractEventLoop):
+        """Thread target that keeps the worker loop running"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+        
     @abstractmethod
     def process_task(self, input_data: dict, task_id: str) -> dict:
-        """Process the task - implement this in subclasses"""
-        pass
\ No newline at end of file
+        """Process the task - implement this in subclasses (sync or async)"""
+        pass
+
+atexit.register(BaseWorker.shutdown_event_loop)
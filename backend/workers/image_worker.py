@@ -1,21 +1,26 @@
 import asyncio
-import httpx
 import logging
 import os
 from urllib.parse import quote
 from workers.base_worker import BaseWorker
 from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from utils.stage_output import StageOutput
+from utils.http_client import HttpClient
+from utils.content_cache import ContentCache
 from config import Config
 
 logger = logging.getLogger(__name__)
 
 class ImageWorker(BaseWorker):
-    def __init__(self):
-        super().__init__("generate_images", poll_interval=1.0)
+    def __init__(self, task_def_name: str = "generate_images"):
+        super().__init__(task_def_name, poll_interval=1.0)
+        self.cache = ContentCache(Config.IMAGE_CACHE_DIR, Config.IMAGE_CACHE_MAX_BYTES, '.jpg') if Config.IMAGE_CACHE_ENABLED else None
         
-    def process_task(self, input_data: dict, task_id: str) -> dict:
+    async def process_task(self, input_data: dict, task_id: str) -> dict:
         """Generate images for script scenes using Pollinations.ai"""
-        script = input_data.get('script')
+        script = StageOutput.resolve(input_data, 'script')
+        run_id = input_data.get('run_id')
         
         if not script or not script.get('scenes'):
             raise Exception('Script with scenes is required for image generation')
@@ -23,75 +28,85 @@ class ImageWorker(BaseWorker):
         logger.info(f"Generating images for {len(script['scenes'])} scenes")
         logger.info(f"Script title: '{script['title']}'")
         
-        # Use asyncio to run async image generation
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            images = loop.run_until_complete(self._generate_images_for_script(script))
-        finally:
-            loop.close()
+        images = await self._generate_images_for_script(script, run_id)
         
         successful_images = [img for img in images if img.get('filepath') and not img.get('error')]
         failed_images = [img for img in images if img.get('error')]
+        cached_images = [img for img in images if img.get('cached')]
         
         logger.info(f"Image generation completed:")
         logger.info(f"  Successful: {len(successful_images)}/{len(script['scenes'])}")
         if failed_images:
             logger.info(f"  Failed: {len(failed_images)}")
+        if self.cache:
+            logger.info(f"  From cache: {len(cached_images)} (process totals: {self.cache.stats()})")
         
+        # The script is already stored for the run; only the new list goes out
         return {
-            'images': images,
-            'script': script,
+            **StageOutput.output(run_id, 'images', images, self.task_def_name),
             'statistics': {
                 'totalScenes': len(script['scenes']),
                 'successfulImages': len(successful_images),
                 'failedImages': len(failed_images),
+                'cachedImages': len(cached_images),
                 'successRate': round((len(successful_images) / len(script['scenes'])) * 100)
             },
             'message': f"Generated {len(successful_images)}/{len(script['scenes'])} images successfully"
         }
         
-    async def _generate_images_for_script(self, script: dict) -> list:
-        """Generate images for all scenes in the script"""
-        images = []
+    async def _generate_images_for_script(self, script: dict, run_id: str = None) -> list:
+        """Generate images for all scenes in the script, a bounded number at a time"""
         FileHandler.ensure_directories()
         
-        for i, scene in enumerate(script['scenes']):
-            filename = f"scene_{i + 1}.jpg"
-            
-            try:
-                image_result = await self._generate_image(
-                    scene['visualDescription'], 
-                    filename
-                )
-                
-                images.append({
-                    'sceneIndex': i,
-                    'filename': filename,
-                    'filepath': image_result['filepath'],
-                    'duration': scene['duration'],
-                    'prompt': scene['visualDescription']
-                })
-                
-                # Small delay between requests to be respectful
-                await asyncio.sleep(1)
-                
-            except Exception as image_error:
-                logger.error(f"Failed to generate image for scene {i + 1}: {image_error}")
-                
-                images.append({
-                    'sceneIndex': i,
-                    'filename': f"placeholder_{i + 1}.jpg",
-                    'filepath': None,
-                    'duration': scene['duration'],
-                    'prompt': scene['visualDescription'],
-                    'error': str(image_error)
-                })
+        # Fan out every scene but keep at most IMAGE_CONCURRENCY requests in flight
+        semaphore = asyncio.Semaphore(max(1, Config.IMAGE_CONCURRENCY))
+        
+        async def generate_scene(i: int, scene: dict) -> dict:
+            async with semaphore:
+                return await self._generate_scene_image(i, scene, run_id)
+        
+        # gather preserves argument order, so results stay in scene order
+        images = await asyncio.gather(*(
+            generate_scene(i, scene) for i, scene in enumerate(script['scenes'])
+        ))
         
         logger.info(f"Generated {len([img for img in images if img.get('filepath')])}/{len(script['scenes'])} images")
-        return images
+        return list(images)
+        
+    async def _generate_scene_image(self, i: int, scene: dict, run_id: str = None) -> dict:
+        """Generate the image for a single scene, returning a placeholder entry on failure"""
+        filename = f"scene_{i + 1}.jpg"
+        
+        try:
+            image_result = await self._generate_image(
+                scene['visualDescription'], 
+                filename,
+                run_id=run_id
+            )
+            
+            return {
+                'sceneIndex': i,
+                'filename': filename,
+                'filepath': image_result['filepath'],
+                'duration': scene['duration'],
+                'prompt': scene['visualDescription'],
+                'cached': image_result.get('cached', False)
+            }
+            
+        except Exception as image_error:
+            logger.error(f"Failed to generate image for scene {i + 1}: {image_error}")
+            
+            return {
+                'sceneIndex': i,
+                'filename': f"placeholder_{i + 1}.jpg",
+                'filepath': None,
+                'duration': scene['duration'],
+                'prompt': scene['visualDescription'],
+                'error': str(image_error)
+            }
         
-    async def _generate_image(self, prompt: str, filename: str, width: int = 1024, height: int = 576) -> dict:
+    async def _generate_image(self, prompt: str, filename: str, width: int = 1024, height: int = 576,
+                              run_id: str = None) -> dict:
         """Generate a single image using Pollinations.ai"""
         try:
             # Clean and shorten the prompt
@@ -99,6 +114,27 @@ class ImageWorker(BaseWorker):
             if len(clean_prompt) > 100:
                 clean_prompt = clean_prompt[:100].strip()
                 
+            filepath = FileHandler.get_temp_path(filename, run_id)
+            
+            # Identical prompts at the same size come from the cache instead of the API
+            cache_key = None
+            if self.cache:
+                cache_key = ContentCache.make_key(
+                    provider='pollinations',
+                    prompt=' '.join(clean_prompt.split()),
+                    width=width,
+                    height=height
+                )
+                if self.cache.get(cache_key, filepath):
+                    ArtifactManifest.record(run_id, filepath, self.task_def_name)
+                    logger.info(f"Image cache hit: {filename}")
+                    return {
+                        'filepath': filepath,
+                        'prompt': clean_prompt,
+                        'filename': filename,
+                        'cached': True
+                    }
+                    
             encoded_prompt = quote(clean_prompt)
             
             # Pollinations.ai API endpoint
@@ -113,10 +149,8 @@ class ImageWorker(BaseWorker):
                 try:
                     logger.info(f"Attempt {attempt}/{max_retries}")
                     
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.get(url, headers={
-                            'User-Agent': 'VideoGenerator/1.0'
-                        })
+                    client = HttpClient.get_client()
+                    response = await client.get(url)
                         
                     if response.status_code == 200:
                         logger.info(f"Success on attempt {attempt}")
@@ -135,9 +169,11 @@ class ImageWorker(BaseWorker):
                     logger.info(f"Waiting {delay}s before retry...")
                     await asyncio.sleep(delay)
             
-            # Save image to temp directory
-            filepath = FileHandler.get_temp_path(filename)
+            # Save image to the run's temp directory
             await FileHandler.save_binary(response.content, filepath)
+            ArtifactManifest.record(run_id, filepath, self.task_def_name, response.content)
+            if cache_key:
+                self.cache.put(cache_key, response.content)
             
             logger.info(f"Image saved: {filename}")
             return {
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from workers.audio_worker import AudioWorker
+from utils.file_handler import FileHandler
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class SceneAudioWorker(AudioWorker):
+    def __init__(self):
+        super().__init__("generate_scene_audio")
+        
+    async def process_task(self, input_data: dict, task_id: str) -> dict:
+        """Generate the narration for one scene (per-scene fan-out)"""
+        scene = input_data.get('scene')
+        scene_index = input_data.get('sceneIndex')
+        run_id = input_data.get('run_id')
+        
+        if not scene or scene_index is None:
+            raise Exception('Scene and sceneIndex are required for scene audio generation')
+            
+        FileHandler.ensure_directories()
+        
+        # Bounds this scene's chunk requests; other scenes run in other tasks
+        semaphore = asyncio.Semaphore(max(1, Config.AUDIO_CONCURRENCY))
+        audio_file = await self._generate_scene_audio(scene_index, scene, semaphore, run_id)
+        
+        return {
+            'audioFile': audio_file,
+            'message': (
+                f"Generated audio for scene {scene_index + 1}"
+                if audio_file.get('filepath')
+                else f"Audio for scene {scene_index + 1} failed: {audio_file.get('error')}"
+            )
+        }
@@ -0,0 +1,30 @@
+import logging
+from workers.image_worker import ImageWorker
+from utils.file_handler import FileHandler
+
+logger = logging.getLogger(__name__)
+
+class SceneImageWorker(ImageWorker):
+    def __init__(self):
+        super().__init__("generate_scene_image")
+        
+    async def process_task(self, input_data: dict, task_id: str) -> dict:
+        """Generate the image for one scene (per-scene fan-out)"""
+        scene = input_data.get('scene')
+        scene_index = input_data.get('sceneIndex')
+        run_id = input_data.get('run_id')
+        
+        if not scene or scene_index is None:
+            raise Exception('Scene and sceneIndex are required for scene image generation')
+            
+        FileHandler.ensure_directories()
+        image = await self._generate_scene_image(scene_index, scene, run_id)
+        
+        return {
+            'image': image,
+            'message': (
+                f"Generated image for scene {scene_index + 1}"
+                if image.get('filepath')
+                else f"Image for scene {scene_index + 1} failed: {image.get('error')}"
+            )
+        }
@@ -0,0 +1,240 @@
+import asyncio
+import functools
+import json
+import logging
+import shutil
+import tempfile
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from workers.base_worker import BaseWorker
+from workers.image_worker import ImageWorker
+from workers.audio_worker import AudioWorker
+from workers.video_worker import VideoWorker
+from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from utils.stage_output import StageOutput
+from utils.scene_log import SceneLog
+from utils.video_renderer import VideoRenderer, render_segment
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class ScenePipelineWorker(BaseWorker):
+    def __init__(self):
+        super().__init__("pipeline_scenes", poll_interval=1.0)
+        # The stage workers are used for their generation and assembly steps, not polled
+        self.image_worker = ImageWorker()
+        self.audio_worker = AudioWorker()
+        self.video_worker = VideoWorker()
+        
+    async def process_task(self, input_data: dict, task_id: str) -> dict:
+        """Move each scene through image, audio and segment render on its own, then join the segments"""
+        # Runs beside generate_script and follows its scenes.jsonl; a script passed in is used as-is
+        script = StageOutput.resolve(input_data, 'script')
+        quality = input_data.get('quality') or 'final'
+        run_id = input_data.get('run_id')
+        
+        if script is None and not run_id:
+            raise Exception('Script or run_id is required for the scene pipeline')
+        if script is not None and not script.get('scenes'):
+            raise Exception('Script with scenes is required for the scene pipeline')
+            
+        logger.info(f"Pipelining scenes for run {run_id} ({quality})")
+        FileHandler.ensure_directories()
+        
+        try:
+            video_result = await self._pipeline_video(quality, run_id, script)
+        except Exception as e:
+            logger.error(f"Scene pipeline failed: {e}")
+            raise Exception(f"Scene pipeline failed: {e}")
+            
+        return {
+            **self.video_worker._build_task_output(video_result, video_result['script'], quality),
+            **StageOutput.output(run_id, 'images', video_result['images'], self.task_def_name),
+            **StageOutput.output(run_id, 'audioFiles', video_result['audioFiles'], self.task_def_name),
+            'statistics': video_result['statistics']
+        }
+        
+    async def _scene_updates(self, run_id: str, script: dict = None) -> AsyncIterator[Tuple[List[dict], Optional[dict]]]:
+        """Yield (scenes so far, final script or None) each time the run's scene log changes, ending with the final script"""
+        if script is not None:
+            yield script['scenes'], script
+            return
+            
+        seen = None
+        deadline = time.monotonic() + Config.SCENE_STREAM_WAIT_SECONDS
+        while True:
+            scenes, final = SceneLog.read(run_id)
+            if final:
+                yield scenes, {'title': final['title'], 'totalDuration': final['totalDuration'], 'scenes': scenes}
+                return
+            if scenes != seen:
+                seen = scenes
+                deadline = time.monotonic() + Config.SCENE_STREAM_WAIT_SECONDS
+                yield scenes, None
+            elif time.monotonic() > deadline:
+                raise Exception(f"No new scenes from the script for {Config.SCENE_STREAM_WAIT_SECONDS:g}s")
+            await asyncio.sleep(Config.SCENE_STREAM_POLL_INTERVAL)
+            
+    async def _pipeline_video(self, quality: str, run_id: str = None, script: dict = None) -> dict:
+        """Start each scene's stages as soon as the scene is known, rendering its segment once its inputs exist"""
+        started = time.monotonic()
+        
+        # The stage bounds still apply across all scenes
+        image_semaphore = asyncio.Semaphore(max(1, Config.IMAGE_CONCURRENCY))
+        audio_semaphore = asyncio.Semaphore(max(1, Config.AUDIO_CONCURRENCY))
+        
+        async def generate_image(i: int, scene: dict) -> dict:
+            async with image_semaphore:
+                return await self.image_worker._generate_scene_image(i, scene, run_id)
+                
+        # Per scene index: (key of the inputs it was started from, task); a streamed scene that the
+        # final script changes is started again, and scenes the final script dropped are cancelled
+        image_tasks: Dict[int, tuple] = {}
+        audio_tasks: Dict[int, tuple] = {}
+        render_tasks: Dict[int, tuple] = {}
+        
+        def start(tasks: dict, i: int, key: str, make_coroutine):
+            current = tasks.get(i)
+            if current and current[0] == key:
+                return
+            if current:
+                logger.info(f"Scene {i + 1} changed, restarting it")
+                current[1].cancel()
+            tasks[i] = (key, asyncio.create_task(make_coroutine()))
+            
+        renderer = VideoRenderer.for_quality(quality) if Config.VIDEO_RENDER_ENABLED else None
+        segment_paths = {}
+        segment_errors = {}
+        first_segment_seconds = None
+        script_seconds = None
+        
+        executor = VideoRenderer.create_executor(renderer.workers) if renderer else None
+        segment_dir = tempfile.mkdtemp(prefix='segments_', dir=FileHandler.get_run_output_dir(run_id)) if renderer else None
+        loop = asyncio.get_running_loop()
+        
+        async def render_scene(i: int, prefix: List[dict], image_task, prefix_audio_tasks: list, previous_image_task):
+            nonlocal first_segment_seconds
+            # Shielded: the media tasks outlive a render that is restarted
+            image = await asyncio.shield(image_task)
+            prefix_audio = [await asyncio.shield(task) for task in prefix_audio_tasks]
+            
+            # Scenes stretch to their narration, so where this one starts depends on every earlier scene's audio
+            frame_counts = await asyncio.to_thread(renderer.get_frame_counts, [
+                VideoWorker._build_scene_data(j, scene, None, audio) for j, (scene, audio) in enumerate(zip(prefix, prefix_audio))
+            ])
+            
+            # The crossfade into a scene starts from the previous scene's image
+            previous_scene = None
+            if i > 0:
+                previous_scene = VideoWorker._build_scene_data(
+                    i - 1, prefix[i - 1], await asyncio.shield(previous_image_task), prefix_audio[i - 1]
+                )
+                
+            # A restarted render can't stop the old one's process, so each render gets its own directory
+            job = renderer.build_segment_job(
+                i, VideoWorker._build_scene_data(i, prefix[i], image, prefix_audio[i]), frame_counts,
+                tempfile.mkdtemp(dir=segment_dir), previous_scene
+            )
+            try:
+                segment_paths[i] = await loop.run_in_executor(executor, render_segment, job)
+                segment_errors.pop(i, None)
+                if first_segment_seconds is None:
+                    first_segment_seconds = round(time.monotonic() - started, 3)
+                logger.info(f"Segment {i + 1} rendered")
+            except Exception as e:
+                logger.error(f"Segment {i + 1} failed to render: {e}")
+                segment_paths.pop(i, None)
+                segment_errors[i] = str(e)
+                
+        try:
+            async for scenes, script in self._scene_updates(run_id, script):
+                for i, scene in enumerate(scenes):
+                    start(image_tasks, i, scene.get('visualDescription'), functools.partial(generate_image, i, scene))
+                    start(audio_tasks, i, scene.get('text'), functools.partial(
+                        self.audio_worker._generate_scene_audio, i, scene, audio_semaphore, run_id
+                    ))
+                    
+                if renderer:
+                    # A segment depends only on the scenes up to it, so known scenes render right away
+                    for i in range(len(scenes)):
+                        key = json.dumps(scenes[:i + 1], sort_keys=True)
+                        start(render_tasks, i, key, functools.partial(
+                            render_scene, i, scenes[:i + 1], image_tasks[i][1],
+                            [audio_tasks[j][1] for j in range(i + 1)], image_tasks[i - 1][1] if i > 0 else None
+                        ))
+                        
+            if not script['scenes']:
+                raise Exception('Script with scenes is required for the scene pipeline')
+            script_seconds = round(time.monotonic() - started, 3)
+            scene_count = len(script['scenes'])
+            logger.info(f"Script final with {scene_count} scenes: '{script['title']}'")
+            for tasks in (image_tasks, audio_tasks, render_tasks):
+                for i in [i for i in tasks if i >= scene_count]:
+                    tasks.pop(i)[1].cancel()
+            for results in (segment_paths, segment_errors):
+                for i in [i for i in results if i >= scene_count]:
+                    del results[i]
+                    
+            images = list(await asyncio.gather(*(image_tasks[i][1] for i in range(scene_count))))
+            audio_files = list(await asyncio.gather(*(audio_tasks[i][1] for i in range(scene_count))))
+            if renderer:
+                await asyncio.gather(*(render_tasks[i][1] for i in range(scene_count)))
+                # Blocking file and ffmpeg work runs off the loop, which other runs' tasks share
+                video_path, render_error = await asyncio.to_thread(
+                    self._join_segments,
+                    [segment_paths.get(i) for i in range(scene_count)], segment_errors, quality, run_id, renderer
+                )
+            else:
+                video_path, render_error = None, None
+        finally:
+            for tasks in (image_tasks, audio_tasks, render_tasks):
+                for _, task in tasks.values():
+                    task.cancel()
+            if renderer:
+                executor.shutdown(wait=False)
+                shutil.rmtree(segment_dir, ignore_errors=True)
+                
+        video_data = self.video_worker._build_video_data(script, images, audio_files)
+        project_file_path, project_ref = await asyncio.to_thread(self.video_worker._write_project, video_data, run_id)
+        preview_path = await asyncio.to_thread(self.video_worker._write_preview, video_data, video_path, run_id)
+        
+        logger.info(f"Scene pipeline finished in {time.monotonic() - started:.1f}s")
+        return {
+            'videoPath': video_path,
+            'projectPath': project_file_path,
+            'previewPath': preview_path,
+            'videoData': video_data,
+            'projectRef': project_ref,
+            'renderError': render_error,
+            'script': script,
+            'images': images,
+            'audioFiles': audio_files,
+            'statistics': {
+                **video_data['statistics'],
+                'renderedSegments': len(segment_paths),
+                'failedSegments': len(segment_errors),
+                'scriptSeconds': script_seconds,
+                'firstSegmentSeconds': first_segment_seconds,
+                'totalSeconds': round(time.monotonic() - started, 3)
+            }
+        }
+        
+    def _join_segments(self, segment_paths: list, segment_errors: dict, quality: str, run_id: str,
+                       renderer: VideoRenderer) -> tuple:
+        """Concatenate the segments that rendered; returns (video path, render error)"""
+        ready = [path for path in segment_paths if path]
+        render_error = None
+        if segment_errors:
+            render_error = '; '.join(f"scene {i + 1}: {error}" for i, error in sorted(segment_errors.items()))
+        if not ready:
+            return None, render_error or 'No segments rendered'
+            
+        try:
+            video_path = self.video_worker._get_video_path(quality, run_id)
+            renderer.concat_segments(ready, video_path)
+            ArtifactManifest.record(run_id, video_path, self.task_def_name)
+            return video_path, render_error
+        except Exception as e:
+            logger.error(f"Joining segments failed: {e}")
+            return None, str(e)
@@ -0,0 +1,39 @@
+import logging
+from workers.base_worker import BaseWorker
+from utils.stage_output import StageOutput
+
+logger = logging.getLogger(__name__)
+
+class ScenePlanWorker(BaseWorker):
+    def __init__(self):
+        super().__init__("plan_scene_tasks", poll_interval=1.0)
+        
+    def process_task(self, input_data: dict, task_id: str) -> dict:
+        """Plan one image task and one audio task per scene for the dynamic fork"""
+        script = StageOutput.resolve(input_data, 'script')
+        voice = input_data.get('voice') or 'nova'
+        run_id = input_data.get('run_id')
+        
+        if not script or not script.get('scenes'):
+            raise Exception('Script with scenes is required to plan scene tasks')
+            
+        dynamic_tasks = []
+        dynamic_tasks_input = {}
+        for i, scene in enumerate(script['scenes']):
+            image_ref = f"scene_image_{i + 1}"
+            audio_ref = f"scene_audio_{i + 1}"
+            
+            dynamic_tasks.append({'name': 'generate_scene_image', 'taskReferenceName': image_ref, 'type': 'SIMPLE'})
+            dynamic_tasks.append({'name': 'generate_scene_audio', 'taskReferenceName': audio_ref, 'type': 'SIMPLE'})
+            
+            # Each task carries only its own scene, never the whole script
+            dynamic_tasks_input[image_ref] = {'scene': scene, 'sceneIndex': i, 'run_id': run_id}
+            dynamic_tasks_input[audio_ref] = {'scene': scene, 'sceneIndex': i, 'voice': voice, 'run_id': run_id}
+            
+        logger.info(f"Planned {len(dynamic_tasks)} scene tasks for {len(script['scenes'])} scenes")
+        
+        return {
+            'dynamicTasks': dynamic_tasks,
+            'dynamicTasksInput': dynamic_tasks_input,
+            'scenesCount': len(script['scenes'])
+        }
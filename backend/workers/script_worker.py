@@ -1,15 +1,24 @@
 import json
+import time
 import logging
 import cohere
+from typing import Callable, Optional, Set
 from workers.base_worker import BaseWorker
+from utils.stage_output import StageOutput
+from utils.scene_stream import SceneStreamParser
+from utils.scene_log import SceneLog
+from utils.content_cache import ContentCache
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+COHERE_MODEL = 'command-r-plus'
+
 class ScriptWorker(BaseWorker):
     def __init__(self):
         super().__init__("generate_script", poll_interval=1.0)
         self.client = None
+        self.cache = ContentCache(Config.SCRIPT_CACHE_DIR, Config.SCRIPT_CACHE_MAX_BYTES, '.json') if Config.SCRIPT_CACHE_ENABLED else None
         
     def _get_client(self):
         """Initialize Cohere client lazily to avoid pickling issues"""
@@ -21,22 +30,32 @@ class ScriptWorker(BaseWorker):
         """Generate video script using Cohere AI"""
         topic = input_data.get('topic')
         duration = input_data.get('duration', 30)
+        run_id = input_data.get('run_id')
+        use_cache = input_data.get('use_cache') is not False
         
         if not topic:
             raise Exception('Topic is required for script generation')
             
         logger.info(f"Generating script for topic: '{topic}' ({duration}s)")
         
+        # Scenes are appended to the run's scenes.jsonl as soon as they are known
+        on_scene = None
+        if run_id:
+            SceneLog.reset(run_id)
+            on_scene = lambda index, scene: SceneLog.append(run_id, index, scene)
+            
         try:
-            script = self._generate_script(topic, duration)
-            logger.info(f"Script generated successfully: '{script['title']}'")
+            script, cached = self._get_script(topic, duration, use_cache, on_scene)
+            SceneLog.write_final(run_id, script, self.task_def_name)
+            logger.info(f"Script {'loaded from cache' if cached else 'generated successfully'}: '{script['title']}'")
             logger.info(f"Generated {len(script['scenes'])} scenes")
             
             return {
-                'script': script,
+                **StageOutput.output(run_id, 'script', script, self.task_def_name),
                 'topic': topic,
                 'duration': duration,
                 'scenesCount': len(script['scenes']),
+                'cached': cached,
                 'message': f"Successfully generated script: '{script['title']}'"
             }
             
@@ -46,16 +65,57 @@ class ScriptWorker(BaseWorker):
             
             # Fallback script generation
             script = self._generate_fallback_script(topic, duration)
+            SceneLog.write_final(run_id, script, self.task_def_name)
             return {
-                'script': script,
+                **StageOutput.output(run_id, 'script', script, self.task_def_name),
                 'topic': topic,
                 'duration': duration,
                 'scenesCount': len(script['scenes']),
+                'cached': False,
                 'message': f"Generated fallback script: '{script['title']}'"
             }
             
-    def _generate_script(self, topic: str, duration: int = 30) -> dict:
-        """Generate script using Cohere AI"""
+    def _get_script(self, topic: str, duration: int, use_cache: bool = True,
+                    on_scene: Optional[Callable[[int, dict], None]] = None) -> tuple:
+        """Get the script for (topic, duration) from the cache, generating it on a miss; returns (script, cached)"""
+        if not self.cache or not use_cache:
+            return self._generate_script(topic, duration, on_scene), False
+            
+        cache_key = ContentCache.make_key(model=COHERE_MODEL, topic=' '.join(topic.split()), duration=duration)
+        script = self._read_cached_script(cache_key)
+        if script:
+            self._emit_scenes(script, on_scene)
+            return script, True
+            
+        # Single flight: concurrent identical requests wait for the first one's call instead of making their own
+        with self.cache.lock(cache_key):
+            script = self._read_cached_script(cache_key)
+            if script:
+                self._emit_scenes(script, on_scene)
+                return script, True
+                
+            # Only real generations are cached; a failure raises and the fallback script is never stored
+            script = self._generate_script(topic, duration, on_scene)
+            self.cache.put(cache_key, json.dumps({'createdAt': time.time(), 'script': script}).encode('utf-8'))
+            return script, False
+            
+    def _read_cached_script(self, cache_key: str) -> Optional[dict]:
+        """Get a cached script younger than SCRIPT_CACHE_TTL_SECONDS"""
+        content = self.cache.read(cache_key)
+        if content is None:
+            return None
+            
+        try:
+            entry = json.loads(content)
+        except json.JSONDecodeError:
+            return None
+        if time.time() - entry.get('createdAt', 0) > Config.SCRIPT_CACHE_TTL_SECONDS:
+            return None
+        return entry.get('script')
+        
+    def _generate_script(self, topic: str, duration: int = 30,
+                         on_scene: Optional[Callable[[int, dict], None]] = None) -> dict:
+        """Generate script using Cohere AI, passing each scene to on_scene as soon as it is complete"""
         prompt = f"""Create a {duration}-second engaging video script about "{topic}".
 
 Requirements:
@@ -92,13 +152,17 @@ Return ONLY valid JSON in this exact format:
 }}"""
 
         client = self._get_client()
-        response = client.generate(
-            model='command-r-plus',
-            prompt=prompt,
-            max_tokens=2048,
-            temperature=0.7
-        )
-        text = response.generations[0].text
+        emitted: Set[int] = set()
+        if Config.SCRIPT_STREAMING_ENABLED:
+            text = self._stream_completion(client, prompt, on_scene, emitted)
+        else:
+            response = client.generate(
+                model=COHERE_MODEL,
+                prompt=prompt,
+                max_tokens=2048,
+                temperature=0.7
+            )
+            text = response.generations[0].text
         
         # Clean up response to ensure valid JSON
         text = text.replace('```json\n', '').replace('```\n', '').replace('```', '').strip()
@@ -106,10 +170,41 @@ Return ONLY valid JSON in this exact format:
         try:
             script_data = json.loads(text)
             logger.info(f"Script generated successfully: {script_data['title']}")
+            self._emit_scenes(script_data, on_scene, emitted)
             return script_data
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse Cohere response as JSON: {e}")
             
+    def _stream_completion(self, client, prompt: str, on_scene: Optional[Callable[[int, dict], None]],
+                           emitted: Set[int]) -> str:
+        """Stream the completion, passing each scene to on_scene the moment its JSON object closes"""
+        parser = SceneStreamParser()
+        stream = client.generate_stream(
+            model=COHERE_MODEL,
+            prompt=prompt,
+            max_tokens=2048,
+            temperature=0.7
+        )
+        
+        for event in stream:
+            if getattr(event, 'event_type', None) != 'text-generation':
+                continue
+            for index, scene in parser.feed(event.text):
+                emitted.add(index)
+                if on_scene:
+                    on_scene(index, scene)
+                    
+        return parser.text
+        
+    @staticmethod
+    def _emit_scenes(script: dict, on_scene: Optional[Callable[[int, dict], None]], emitted: Set[int] = frozenset()):
+        """Pass the script's scenes that were not streamed already to on_scene"""
+        if not on_scene:
+            return
+        for index, scene in enumerate(script.get('scenes', [])):
+            if index not in emitted:
+                on_scene(index, scene)
+                
     def _generate_fallback_script(self, topic: str, duration: int) -> dict:
         """Generate a fallback script without API"""
         num_scenes = max(2, min(5, duration // 3))
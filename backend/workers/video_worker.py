@@ -1,8 +1,13 @@
 import json
 import logging
+import os
 from datetime import datetime
 from workers.base_worker import BaseWorker
 from utils.file_handler import FileHandler
+from utils.artifact_manifest import ArtifactManifest
+from utils.stage_output import StageOutput
+from utils.video_renderer import VideoRenderer
+from config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +17,17 @@ class VideoWorker(BaseWorker):
         
     def process_task(self, input_data: dict, task_id: str) -> dict:
         """Assemble video from images, audio and script"""
-        images = input_data.get('images')
-        audio_files = input_data.get('audioFiles')
-        script = input_data.get('script')
+        images = StageOutput.resolve(input_data, 'images')
+        audio_files = StageOutput.resolve(input_data, 'audioFiles')
+        script = StageOutput.resolve(input_data, 'script')
+        quality = input_data.get('quality') or 'final'
+        run_id = input_data.get('run_id')
         
+        # Per-scene fan-out delivers a join output ({taskRef: output}) instead of the two lists
+        scene_results = input_data.get('sceneResults')
+        if scene_results and not (images and audio_files):
+            images, audio_files = self._collect_scene_results(scene_results)
+            
         if not images or not audio_files or not script:
             raise Exception('Images, audioFiles, and script are required for video assembly')
             
@@ -23,103 +35,203 @@ class VideoWorker(BaseWorker):
         logger.info(f"Scenes: {len(script['scenes'])}")
         logger.info(f"Images: {len(images)}")
         logger.info(f"Audio files: {len(audio_files)}")
+        logger.info(f"Quality: {quality}")
         
         try:
-            video_result = self._assemble_video(images, audio_files, script)
+            video_result = self._assemble_video(images, audio_files, script, quality, run_id)
             logger.info("Video assembly completed successfully!")
             
-            return {
-                'videoPath': video_result['projectPath'],
-                'previewPath': video_result['previewPath'], 
-                'videoData': video_result['videoData'],
-                'message': f"Video project created successfully: '{script['title']}'",
-                'instructions': {
-                    'projectFile': 'Check video_project.json for complete data',
-                    'previewFile': 'Open video_preview.html in browser to see scenes',
-                    'nextSteps': 'Integrate with actual video rendering library (FFmpeg/Editly)'
-                }
-            }
+            return self._build_task_output(video_result, script, quality)
             
         except Exception as e:
             logger.error(f"Video assembly failed: {e}")
             raise Exception(f"Video assembly failed: {e}")
             
-    def _assemble_video(self, images: list, audio_files: list, script: dict) -> dict:
-        """Assemble video components into project files"""
+    def _build_task_output(self, video_result: dict, script: dict, quality: str) -> dict:
+        """Task output for an assembled video"""
+        output = {
+            'videoPath': video_result['videoPath'],
+            'projectPath': video_result['projectPath'],
+            'previewPath': video_result['previewPath'], 
+            'quality': quality,
+            'message': (
+                f"Video rendered successfully: '{script['title']}'"
+                if video_result['videoPath']
+                else f"Video project created successfully: '{script['title']}'"
+            ),
+            'instructions': {
+                'videoFile': f"Play video{'_draft' if quality == 'draft' else ''}.mp4 for the rendered video",
+                'projectFile': 'Check video_project.json for complete data',
+                'previewFile': 'Open video_preview.html in browser to see scenes'
+            }
+        }
+        # The project file already holds videoData; send only its reference when there is one
+        if video_result['projectRef'] and Config.STAGE_OUTPUT_REFS:
+            output['videoDataRef'] = video_result['projectRef']
+        else:
+            output['videoData'] = video_result['videoData']
+        if video_result.get('renderError'):
+            output['renderError'] = video_result['renderError']
+        return output
+        
+    @staticmethod
+    def _collect_scene_results(scene_results: dict) -> tuple:
+        """Rebuild scene-ordered images and audioFiles lists from per-scene task outputs"""
+        outputs = [output for output in scene_results.values() if isinstance(output, dict)]
+        images = sorted(
+            (output['image'] for output in outputs if output.get('image')),
+            key=lambda image: image['sceneIndex']
+        )
+        audio_files = sorted(
+            (output['audioFile'] for output in outputs if output.get('audioFile')),
+            key=lambda audio: audio['sceneIndex']
+        )
+        return images, audio_files
+        
+    def _assemble_video(self, images: list, audio_files: list, script: dict, quality: str = 'final',
+                        run_id: str = None) -> dict:
+        """Assemble video components into project files and render them at the given quality"""
         try:
             logger.info("Starting video assembly...")
             
             # Ensure output directory exists
             FileHandler.ensure_directories()
             
-            # For now, create a video project simulation
-            # In production, you'd use FFmpeg or similar library here
-            
-            video_data = {
-                'title': script['title'],
-                'totalDuration': script['totalDuration'],
-                'scenes': [
-                    {
-                        'sceneIndex': index,
-                        'startTime': scene['startTime'],
-                        'duration': scene['duration'],
-                        'text': scene['text'],
-                        'visualDescription': scene['visualDescription'],
-                        'imagePath': images[index]['filepath'] if index < len(images) and images[index].get('filepath') else None,
-                        'audioPath': audio_files[index]['filepath'] if index < len(audio_files) and audio_files[index].get('filepath') else None,
-                        'hasImage': index < len(images) and bool(images[index].get('filepath')),
-                        'hasAudio': index < len(audio_files) and bool(audio_files[index].get('filepath'))
-                    }
-                    for index, scene in enumerate(script['scenes'])
-                ],
-                'statistics': {
-                    'totalScenes': len(script['scenes']),
-                    'scenesWithImages': len([img for img in images if img.get('filepath')]),
-                    'scenesWithAudio': len([audio for audio in audio_files if audio.get('filepath')]),
-                    'placeholderAudio': len([audio for audio in audio_files if audio.get('isPlaceholder')])
-                },
-                'timestamp': datetime.now().isoformat()
-            }
+            video_data = self._build_video_data(script, images, audio_files)
+            project_file_path, project_ref = self._write_project(video_data, run_id)
             
-            # Save video project file
-            project_file_path = FileHandler.get_output_path('video_project.json')
-            with open(project_file_path, 'w') as f:
-                json.dump(video_data, f, indent=2)
-                
-            # Create HTML preview
-            html_preview = self._generate_video_preview(video_data)
-            preview_path = FileHandler.get_output_path('video_preview.html')
-            with open(preview_path, 'w', encoding='utf-8') as f:
-                f.write(html_preview)
+            # Render the MP4; a failed render still leaves the project and preview usable
+            video_path = None
+            render_error = None
+            if Config.VIDEO_RENDER_ENABLED:
+                try:
+                    renderer = VideoRenderer.for_quality(quality)
+                    video_path = self._get_video_path(quality, run_id)
+                    renderer.render(video_data['scenes'], video_path)
+                    ArtifactManifest.record(run_id, video_path, self.task_def_name)
+                except Exception as render_exception:
+                    logger.error(f"Video rendering failed: {render_exception}")
+                    video_path = None
+                    render_error = str(render_exception)
+                    
+            preview_path = self._write_preview(video_data, video_path, run_id)
             
             logger.info("Video assembly completed")
             logger.info(f"Project file: {project_file_path}")
             logger.info(f"Preview file: {preview_path}")
-            
+            if video_path:
+                logger.info(f"Video file: {video_path}")
+                
             return {
+                'videoPath': video_path,
                 'projectPath': project_file_path,
                 'previewPath': preview_path,
-                'videoData': video_data
+                'videoData': video_data,
+                'projectRef': project_ref,
+                'renderError': render_error
             }
             
         except Exception as e:
             logger.error(f"Video assembly failed: {e}")
             raise
             
-    def _generate_video_preview(self, video_data: dict) -> str:
+    def render_project(self, run_id: str, quality: str = 'final') -> str:
+        """Re-render a run's saved video_project.json at the given quality, e.g. to promote an approved draft"""
+        with open(FileHandler.get_output_path('video_project.json', run_id)) as f:
+            video_data = json.load(f)
+            
+        video_path = self._get_video_path(quality, run_id)
+        VideoRenderer.for_quality(quality).render(video_data['scenes'], video_path)
+        ArtifactManifest.record(run_id, video_path, self.task_def_name)
+        self._write_preview(video_data, video_path, run_id)
+        logger.info(f"Rendered {quality} video for run {run_id}: {video_path}")
+        return video_path
+        
+    @staticmethod
+    def _build_scene_data(index: int, scene: dict, image: dict = None, audio: dict = None) -> dict:
+        """One entry of video_data['scenes']: the script scene plus its generated image and audio"""
+        image_path = image.get('filepath') if image else None
+        audio_path = audio.get('filepath') if audio else None
+        return {
+            'sceneIndex': index,
+            'startTime': scene['startTime'],
+            'duration': scene['duration'],
+            'text': scene['text'],
+            'visualDescription': scene['visualDescription'],
+            'imagePath': image_path,
+            'audioPath': audio_path,
+            'hasImage': bool(image_path),
+            'hasAudio': bool(audio_path)
+        }
+        
+    @classmethod
+    def _build_video_data(cls, script: dict, images: list, audio_files: list) -> dict:
+        """Project data for the video: scenes with their media paths, and statistics"""
+        return {
+            'title': script['title'],
+            'totalDuration': script['totalDuration'],
+            'scenes': [
+                cls._build_scene_data(
+                    index,
+                    scene,
+                    images[index] if index < len(images) else None,
+                    audio_files[index] if index < len(audio_files) else None
+                )
+                for index, scene in enumerate(script['scenes'])
+            ],
+            'statistics': {
+                'totalScenes': len(script['scenes']),
+                'scenesWithImages': len([img for img in images if img.get('filepath')]),
+                'scenesWithAudio': len([audio for audio in audio_files if audio.get('filepath')]),
+                'placeholderAudio': len([audio for audio in audio_files if audio.get('isPlaceholder')])
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    def _write_project(self, video_data: dict, run_id: str = None) -> tuple:
+        """Save video_project.json, returning its path and stage output reference"""
+        # Its reference stands in for the data in the task output
+        project_ref = StageOutput.write(run_id, 'video_project', video_data, self.task_def_name, indent=2)
+        if project_ref:
+            return project_ref['path'], project_ref
+            
+        project_file_path = FileHandler.get_output_path('video_project.json', run_id)
+        with open(project_file_path, 'w') as f:
+            json.dump(video_data, f, indent=2)
+        return project_file_path, None
+        
+    def _write_preview(self, video_data: dict, video_path: str = None, run_id: str = None) -> str:
+        """Save the HTML preview of the scenes (and the video, when rendered)"""
+        preview_path = FileHandler.get_output_path('video_preview.html', run_id)
+        html_preview = self._generate_video_preview(video_data, video_path, os.path.dirname(preview_path))
+        with open(preview_path, 'w', encoding='utf-8') as f:
+            f.write(html_preview)
+        ArtifactManifest.record(run_id, preview_path, self.task_def_name)
+        return preview_path
+        
+    @staticmethod
+    def _get_video_path(quality: str = 'final', run_id: str = None) -> str:
+        """Where the rendered MP4 goes; drafts never replace an approved final"""
+        return FileHandler.get_output_path('video_draft.mp4' if quality == 'draft' else 'video.mp4', run_id)
+        
+    def _generate_video_preview(self, video_data: dict, video_path: str = None, preview_dir: str = '.') -> str:
         """Generate HTML preview of video scenes"""
         scenes = []
         
         for index, scene in enumerate(video_data['scenes']):
+            # Link artifacts relative to wherever this run's preview is written
+            image_src = os.path.relpath(scene['imagePath'], preview_dir).replace(os.sep, '/') if scene['imagePath'] else None
+            audio_src = os.path.relpath(scene['audioPath'], preview_dir).replace(os.sep, '/') if scene['audioPath'] else None
+            
             image_display = (
-                f'<img src="../temp/scene_{index + 1}.jpg" alt="Scene {index + 1}" style="max-width: 300px; height: auto;">'
+                f'<img src="{image_src}" alt="Scene {index + 1}" style="max-width: 300px; height: auto;">'
                 if scene['hasImage']
                 else '<div style="width: 300px; height: 200px; background: #f0f0f0; display: flex; align-items: center; justify-content: center;">No Image Generated</div>'
             )
             
             audio_display = (
-                f'<audio controls><source src="../temp/audio_scene_{index + 1}.mp3" type="audio/mpeg">Audio not supported</audio>'
-                if scene['hasAudio']
+                f'<audio controls><source src="{audio_src}" type="audio/mpeg">Audio not supported</audio>'
+                if scene['hasAudio'] and not audio_src.endswith('.txt')
                 else '<p style="color: #888;">No Audio Generated</p>'
             )
             
@@ -142,8 +254,13 @@ class VideoWorker(BaseWorker):
             </div>
             """
             scenes.append(scene_html)
-        
+            
         scenes_html = ''.join(scenes)
+        video_html = (
+            f'<div class="video"><video controls style="width: 100%;"><source src="{os.path.basename(video_path)}" type="video/mp4">Video not supported</video></div>'
+            if video_path
+            else ''
+        )
         timestamp = datetime.fromisoformat(video_data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
         
         return f"""<!DOCTYPE html>
@@ -172,6 +289,8 @@ class VideoWorker(BaseWorker):
         <div><strong>Audio Placeholders:</strong> {video_data['statistics']['placeholderAudio']}</div>
     </div>
     
+    {video_html}
+    
     <div class="scenes">
         <h2>Scenes Preview:</h2>
         {scenes_html}
@@ -181,9 +300,6 @@ class VideoWorker(BaseWorker):
         <h3>🎥 Next Steps for Video Production:</h3>
         <ol>
             <li>Install a proper TTS service for audio generation</li>
-            <li>Integrate FFmpeg with video rendering library</li>
-            <li>Add transitions and effects between scenes</li>
-            <li>Implement proper audio synchronization</li>
             <li>Add background music and sound effects</li>
         </ol>
     </div>
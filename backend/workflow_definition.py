@@ -0,0 +1,227 @@
+from typing import List
+from config import Config
+
+WORKFLOW_NAME = "video_generation_workflow"
+
+# Per-scene tasks report progress under the pipeline step they belong to
+STEP_ALIASES = {
+    "plan_scene_tasks": "generate_script",
+    "generate_scene_image": "generate_images",
+    "generate_scene_audio": "generate_audio"
+}
+
+def _task_definition(name: str, description: str, timeout_seconds: int) -> dict:
+    """Conductor task definition for one worker"""
+    return {
+        "name": name,
+        "description": description,
+        "retryCount": 2,
+        "retryLogic": "FIXED",
+        "retryDelaySeconds": 5,
+        "timeoutPolicy": "TIME_OUT_WF",
+        "timeoutSeconds": timeout_seconds,
+        "responseTimeoutSeconds": timeout_seconds,
+        "ownerEmail": Config.WORKFLOW_OWNER_EMAIL
+    }
+
+def _simple_task(name: str, input_parameters: dict) -> dict:
+    """A workflow step handled by the worker polling for `name`"""
+    return {
+        "name": name,
+        "taskReferenceName": name,
+        "type": "SIMPLE",
+        "inputParameters": input_parameters
+    }
+
+TASK_DEFINITIONS = [
+    _task_definition("generate_script", "Write the scene-by-scene script", 120),
+    _task_definition("generate_images", "Generate one image per scene", 300),
+    _task_definition("generate_audio", "Generate narration per scene", 300),
+    _task_definition("assemble_video", "Render the video, project file and preview", 600),
+    _task_definition("plan_scene_tasks", "Plan one image and one audio task per scene", 60),
+    _task_definition("generate_scene_image", "Generate the image for one scene", 120),
+    _task_definition("generate_scene_audio", "Generate narration for one scene", 120),
+    _task_definition("pipeline_scenes", "Take each scene through image, audio and segment render, then join", 900)
+]
+TASK_TIMEOUTS = {task_definition["name"]: task_definition["timeoutSeconds"] for task_definition in TASK_DEFINITIONS}
+
+def _critical_path_seconds(tasks: List[dict]) -> int:
+    """Longest chain of task budgets through a list of workflow tasks"""
+    total = 0
+    for task in tasks:
+        if task["type"] == "SIMPLE":
+            total += TASK_TIMEOUTS[task["name"]]
+        elif task["type"] == "FORK_JOIN":
+            total += max(_critical_path_seconds(branch) for branch in task["forkTasks"])
+        elif task["type"] == "FORK_JOIN_DYNAMIC":
+            # Scene tasks run in parallel; each one's budget covers it once it is picked up
+            total += max(TASK_TIMEOUTS["generate_scene_image"], TASK_TIMEOUTS["generate_scene_audio"])
+    return total
+
+def build_workflow_definition(per_scene: bool = False, pipelined: bool = False) -> dict:
+    """The video workflow; per_scene fans out one image and one audio task per scene,
+    pipelined runs every scene through all stages in one task"""
+    script_task = _simple_task("generate_script", {
+        "topic": "${workflow.input.topic}",
+        "duration": "${workflow.input.duration}",
+        "use_cache": "${workflow.input.use_cache}",
+        "run_id": "${workflow.input.run_id}"
+    })
+    final_task = "assemble_video"
+    if pipelined:
+        # No stage waits for all scenes, not even the script: the pipeline runs beside it and starts
+        # each scene as soon as it streams into scenes.jsonl, rendering its segment once its media exist
+        final_task = "pipeline_scenes"
+        tasks = [
+            {
+                "name": "fork_script_scenes",
+                "taskReferenceName": "fork_script_scenes",
+                "type": "FORK_JOIN",
+                "forkTasks": [
+                    [script_task],
+                    [
+                        _simple_task("pipeline_scenes", {
+                            "voice": "${workflow.input.voice}",
+                            "quality": "${workflow.input.quality}",
+                            "run_id": "${workflow.input.run_id}"
+                        })
+                    ]
+                ]
+            },
+            {
+                "name": "join_script_scenes",
+                "taskReferenceName": "join_script_scenes",
+                "type": "JOIN",
+                "joinOn": ["generate_script", "pipeline_scenes"]
+            }
+        ]
+    elif per_scene:
+        # A dynamic fork sized by the script lets any number of worker replicas share one video
+        media_tasks = [
+            _simple_task("plan_scene_tasks", {
+                "script": "${generate_script.output.script}",
+                "scriptRef": "${generate_script.output.scriptRef}",
+                "voice": "${workflow.input.voice}",
+                "run_id": "${workflow.input.run_id}"
+            }),
+            {
+                "name": "fork_scenes",
+                "taskReferenceName": "fork_scenes",
+                "type": "FORK_JOIN_DYNAMIC",
+                "dynamicForkTasksParam": "dynamicTasks",
+                "dynamicForkTasksInputParamName": "dynamicTasksInput",
+                "inputParameters": {
+                    "dynamicTasks": "${plan_scene_tasks.output.dynamicTasks}",
+                    "dynamicTasksInput": "${plan_scene_tasks.output.dynamicTasksInput}"
+                }
+            },
+            {
+                "name": "join_scenes",
+                "taskReferenceName": "join_scenes",
+                "type": "JOIN"
+            }
+        ]
+        media_inputs = {"sceneResults": "${join_scenes.output}"}
+    else:
+        # Images and audio depend only on the script, so they run as parallel branches
+        media_tasks = [
+            {
+                "name": "fork_media",
+                "taskReferenceName": "fork_media",
+                "type": "FORK_JOIN",
+                "forkTasks": [
+                    [
+                        _simple_task("generate_images", {
+                            "script": "${generate_script.output.script}",
+                            "scriptRef": "${generate_script.output.scriptRef}",
+                            "run_id": "${workflow.input.run_id}"
+                        })
+                    ],
+                    [
+                        _simple_task("generate_audio", {
+                            "script": "${generate_script.output.script}",
+                            "scriptRef": "${generate_script.output.scriptRef}",
+                            "voice": "${workflow.input.voice}",
+                            "run_id": "${workflow.input.run_id}"
+                        })
+                    ]
+                ]
+            },
+            {
+                "name": "join_media",
+                "taskReferenceName": "join_media",
+                "type": "JOIN",
+                "joinOn": ["generate_images", "generate_audio"]
+            }
+        ]
+        media_inputs = {
+            "images": "${generate_images.output.images}",
+            "imagesRef": "${generate_images.output.imagesRef}",
+            "audioFiles": "${generate_audio.output.audioFiles}",
+            "audioFilesRef": "${generate_audio.output.audioFilesRef}"
+        }
+        
+    if not pipelined:
+        tasks = [
+            script_task,
+            *media_tasks,
+            _simple_task(final_task, {
+                **media_inputs,
+                "script": "${generate_script.output.script}",
+                "scriptRef": "${generate_script.output.scriptRef}",
+                "quality": "${workflow.input.quality}",
+                "run_id": "${workflow.input.run_id}"
+            })
+        ]
+        
+    return {
+        "name": WORKFLOW_NAME,
+        # Both shapes stay registered side by side under their own versions
+        "version": 3 if pipelined else 2 if per_scene else 1,
+        "description": "Topic to narrated video: script, then images and audio in parallel, then assembly",
+        "schemaVersion": 2,
+        "restartable": True,
+        "ownerEmail": Config.WORKFLOW_OWNER_EMAIL,
+        "timeoutPolicy": "TIME_OUT_WF",
+        # The workflow gets at least the time its slowest chain of tasks is allowed
+        "timeoutSeconds": Config.WORKFLOW_TIMEOUT_SECONDS or _critical_path_seconds(tasks),
+        "inputParameters": ["topic", "duration", "voice", "quality", "use_cache", "run_id"],
+        "tasks": tasks,
+        "outputParameters": {
+            "videoPath": f"${{{final_task}.output.videoPath}}",
+            "projectPath": f"${{{final_task}.output.projectPath}}",
+            "previewPath": f"${{{final_task}.output.previewPath}}"
+        }
+    }
+
+WORKFLOW_DEFINITION = build_workflow_definition(Config.SCENE_FANOUT_ENABLED, Config.SCENE_PIPELINE_ENABLED)
+WORKFLOW_VERSION = WORKFLOW_DEFINITION["version"]
+WORKFLOW_TIMEOUT_SECONDS = WORKFLOW_DEFINITION["timeoutSeconds"]
+
+def get_step_name(task_type: str) -> str:
+    """The pipeline step a task reports under"""
+    return STEP_ALIASES.get(task_type, task_type)
+
+def get_step_groups(definition: dict = WORKFLOW_DEFINITION) -> List[List[str]]:
+    """Worker steps in execution order; steps in the same group run in parallel"""
+    groups = []
+    for task in definition["tasks"]:
+        if task["type"] == "SIMPLE":
+            step = get_step_name(task["name"])
+            if not any(step in group for group in groups):
+                groups.append([step])
+        elif task["type"] == "FORK_JOIN_DYNAMIC":
+            # Scene tasks are only known at runtime; they report under the media steps
+            groups.append(["generate_images", "generate_audio"])
+        elif task["type"] == "FORK_JOIN":
+            groups.append([
+                branch_task["name"]
+                for branch in task["forkTasks"]
+                for branch_task in branch
+                if branch_task["type"] == "SIMPLE"
+            ])
+    return groups
+
+def get_pipeline_steps(definition: dict = WORKFLOW_DEFINITION) -> List[str]:
+    """Worker steps in execution order, parallel branches flattened"""
+    return [step for group in get_step_groups(definition) for step in group]
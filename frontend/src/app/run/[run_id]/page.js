@@ -3,13 +3,26 @@
 import { useEffect, useMemo, useState } from "react";
 import { useParams } from "next/navigation";
 
-const STEPS = [
-  "generate_script",
-  "generate_images",
-  "generate_audio",
-  "assemble_video",
+const API_URL = "http://127.0.0.1:8000";
+
+// Mirrors the backend workflow definition: steps in one group run in parallel
+const STEP_GROUPS = [
+  ["generate_script"],
+  ["generate_images", "generate_audio"],
+  ["assemble_video"],
 ];
 
+const TERMINAL_STATUSES = ["COMPLETED", "FAILED", "TIMEOUT", "TERMINATED"];
+
+// Workflow variants (e.g. the scene pipeline) have steps of their own; show what the run reports
+const getStepGroups = (steps) => {
+  if (!steps) return STEP_GROUPS;
+  const names = Object.keys(steps);
+  const groups = STEP_GROUPS.filter((group) => group.every((s) => names.includes(s)));
+  const known = groups.flat();
+  return [...groups, ...names.filter((s) => !known.includes(s)).map((s) => [s])];
+};
+
 export default function RunPage() {
   const params = useParams();
   const runId = useMemo(() => params?.run_id?.toString?.() ?? "", [params]);
@@ -20,26 +33,58 @@ export default function RunPage() {
     if (!runId) return;
 
     let cancelled = false;
+    let pollId = null;
+    let source = null;
+
     const fetchRun = async () => {
       try {
-        const res = await fetch(`http://127.0.0.1:8000/runs/${runId}`);
+        const res = await fetch(`${API_URL}/runs/${runId}`);
         if (!res.ok) {
           const txt = await res.text();
           throw new Error(txt || `Failed: ${res.status}`);
         }
         const data = await res.json();
         if (!cancelled) setRun(data);
+        if (TERMINAL_STATUSES.includes(data.status)) stopPolling();
       } catch (e) {
         if (!cancelled) setError(e.message || "Fetch error");
       }
     };
 
-    // Initial fetch, then poll
-    fetchRun();
-    const id = setInterval(fetchRun, 2000);
+    const startPolling = () => {
+      if (pollId || cancelled) return;
+      fetchRun();
+      pollId = setInterval(fetchRun, 2000);
+    };
+
+    const stopPolling = () => {
+      if (pollId) clearInterval(pollId);
+      pollId = null;
+    };
+
+    // Prefer pushed updates; fall back to polling if the stream is unavailable
+    if (typeof EventSource === "undefined") {
+      startPolling();
+    } else {
+      source = new EventSource(`${API_URL}/runs/${runId}/events`);
+      source.addEventListener("run", (event) => {
+        const data = JSON.parse(event.data);
+        if (cancelled) return;
+        setRun(data);
+        setError("");
+        if (TERMINAL_STATUSES.includes(data.status)) source.close();
+      });
+      source.onerror = () => {
+        // Stream dropped or unsupported by the server: keep the page live by polling
+        source.close();
+        if (!cancelled) startPolling();
+      };
+    }
+
     return () => {
       cancelled = true;
-      clearInterval(id);
+      if (source) source.close();
+      stopPolling();
     };
   }, [runId]);
 
@@ -56,7 +101,8 @@ export default function RunPage() {
       "generate_script": "Generate Script",
       "generate_images": "Generate Images", 
       "generate_audio": "Generate Audio",
-      "assemble_video": "Assemble Video"
+      "assemble_video": "Assemble Video",
+      "pipeline_scenes": "Images, Audio & Render (per scene)"
     };
     
     return (
@@ -86,7 +132,24 @@ export default function RunPage() {
       {error && <p style={{ color: "red" }}>Error: {error}</p>}
 
       <div style={{ marginTop: 16, display: "grid", gap: 8 }}>
-        {STEPS.map((s) => renderStep(s))}
+        {getStepGroups(run?.steps).map((group) =>
+          group.length === 1 ? (
+            renderStep(group[0])
+          ) : (
+            <div
+              key={group.join("+")}
+              style={{
+                display: "grid",
+                gap: 8,
+                paddingLeft: 12,
+                borderLeft: "2px solid #e5e7eb",
+              }}
+            >
+              <span style={{ fontSize: 12, color: "#6b7280" }}>In parallel</span>
+              {group.map((s) => renderStep(s))}
+            </div>
+          )
+        )}
       </div>
 
       <div style={{ marginTop: 24 }}>